@@ -1,45 +1,149 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Request, render_template, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
 from datetime import datetime
-from document_parser import DocumentParser
+from document_parser import DocumentParser, detect_mime_type, parse_in_worker
 from search_engine import SearchEngine
-from job_manager import job_manager
-from config import Config
-from metrics_collector import metrics_collector
+from config import Config, TRUTHY
 import tempfile
 import shutil
-import glob
+import hashlib
 import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
     from botocore.config import Config as BotoConfig
     from botocore.exceptions import ClientError
 except Exception:
     boto3 = None
     ClientError = None
 
+# Shared transfer settings for S3 downloads (large objects are fetched in parallel parts)
+S3_TRANSFER_CONFIG = TransferConfig(max_concurrency=20, multipart_threshold=8 << 20, use_threads=True) if boto3 else None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes responses with orjson when it is installed"""
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        # Hand orjson's bytes straight to the response instead of round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+class UploadRequest(Request):
+    """Request that spools each uploaded file in memory up to STREAM_UPLOAD_THRESHOLD, then on disk"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Werkzeug picks memory or disk from the size of the whole request, so every file of a
+        # large bulk upload would go to disk; decide per file instead
+        return tempfile.SpooledTemporaryFile(max_size=Config.STREAM_UPLOAD_THRESHOLD, mode='rb+')
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+app.json = OrjsonProvider(app)
 app.config['UPLOAD_FOLDER'] = Config.UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
+app.config['USE_X_SENDFILE'] = Config.USE_X_SENDFILE
+
+# Server state, created by _init_server() in the serving process. When app.py is run as a
+# script, parse worker processes re-import it as __mp_main__ to resolve pickled functions;
+# there it only defines the routes, and none of this is created. parse_in_worker itself
+# lives in document_parser and needs nothing from this module.
+parser = None
+search_engine = None
+job_manager = None
+metrics_collector = None
+document_index = None
+parse_executor = None
+parse_process_pool = None
+s3_download_executor = None
+job_executor = None
+GROBID_URL = None
 
-# Ensure upload directory exists
-os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-os.makedirs('parsed_documents', exist_ok=True)
-os.makedirs('job_metadata', exist_ok=True)
+# Caps how many CPU-bound parses run at once on the parse threads
+_cpu_parse_slots = threading.BoundedSemaphore(Config.PARSE_WORKERS)
 
-# Initialize components
-parser = DocumentParser()
-search_engine = SearchEngine()
+# Pending search-index updates, applied in submission order by a single indexer thread.
+# Bounded so a burst of uploads blocks briefly instead of growing memory without limit.
+_index_queue = queue.Queue(maxsize=1024)
+INDEX_BATCH_SIZE = 64
 
-# Check GROBID availability
-grobid_available = parser.is_grobid_available()
-if grobid_available:
-    print("✅ GROBID service is available - using enhanced PDF parsing")
-else:
-    print("⚠️  GROBID service not available - using fallback PDF parsing")
-    print("   To enable GROBID, run: ./start_grobid.sh")
+# Last GROBID probe result, reused by /grobid_status for GROBID_STATUS_TTL_SECONDS
+_grobid_cache = {'ts': 0.0, 'available': False}
+
+def _init_server():
+    """Create the server's components, pools and background threads (once, in the serving process)"""
+    global parser, search_engine, job_manager, metrics_collector, document_index
+    global parse_executor, parse_process_pool, s3_download_executor, job_executor, GROBID_URL
+    
+    # Create the data directories once at startup; request handlers assume they exist
+    for folder in Config.DATA_FOLDERS:
+        os.makedirs(folder, exist_ok=True)
+    
+    # These modules build their shared instances (and the job manager's threads) on import
+    from job_manager import job_manager
+    from metrics_collector import metrics_collector
+    from document_index import document_index
+    
+    # Initialize components
+    parser = DocumentParser()
+    parser.warmup(pool_size=Config.GROBID_POOL_SIZE)
+    search_engine = SearchEngine()
+    
+    # Worker pool that validates and parses bulk-uploaded files in parallel. It is sized for the
+    # GROBID calls, which mostly wait on the network; CPU-bound parsing is capped by _cpu_parse_slots.
+    parse_executor = ThreadPoolExecutor(max_workers=max(Config.PARSE_WORKERS, Config.GROBID_CONCURRENCY),
+                                        thread_name_prefix='docusearch-parse')
+    
+    # Optional process pool for CPU-bound parsing; GROBID-bound PDFs stay on the threads.
+    # Workers come from a forkserver rather than fork(): by then this process runs the indexer,
+    # job flusher and IO threads and holds the SQLite connection, and forking it mid-lock can
+    # deadlock a child.
+    parse_process_pool = ProcessPoolExecutor(
+        max_workers=Config.PARSE_PROCESSES,
+        mp_context=multiprocessing.get_context('forkserver')
+    ) if Config.PARSE_PROCESSES > 0 else None
+    
+    # Download pool for S3 imports; each worker fetches one object and then waits on the
+    # parse pool, so at most S3_DOWNLOAD_WORKERS objects sit in the temp dir at once
+    s3_download_executor = ThreadPoolExecutor(max_workers=Config.S3_DOWNLOAD_WORKERS, thread_name_prefix='docusearch-s3')
+    
+    # Runs bulk jobs submitted with async=true after the request has returned
+    job_executor = ThreadPoolExecutor(max_workers=Config.JOB_WORKERS, thread_name_prefix='docusearch-job')
+    
+    # Check GROBID availability
+    grobid_available = parser.is_grobid_available()
+    _grobid_cache.update(ts=time.monotonic(), available=grobid_available)
+    GROBID_URL = parser.grobid_url
+    
+    if grobid_available:
+        print("✅ GROBID service is available - using enhanced PDF parsing")
+    else:
+        print("⚠️  GROBID service not available - using fallback PDF parsing")
+        print("   To enable GROBID, run: ./start_grobid.sh")
+    
+    # Daemon thread: anything still queued at exit is re-indexed from disk on the next start
+    _search_sync['external_writes'] = document_index.external_writes
+    threading.Thread(target=_index_worker, name='docusearch-index', daemon=True).start()
 
 @app.route('/')
 def index():
@@ -57,28 +161,25 @@ def upload_file():
     # Get metadata options
     metadata_options = request.form.get('metadata_options', '[]')
     try:
-        metadata_options = json.loads(metadata_options)
+        metadata_options = _requested_metadata_options(json.loads(metadata_options))
     except:
-        metadata_options = ['title', 'author', 'topic']  # Default options
+        metadata_options = list(Config.DEFAULT_METADATA_OPTIONS)
     
     if file:
         # Save uploaded file
         filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{file.filename}"
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        _save_upload(file, filepath)
         
         try:
             # Parse the document with selected metadata options
             parsed_content = parser.parse_document(filepath, metadata_options)
             
             # Save parsed content
-            parsed_filename = f"parsed_{filename}.json"
-            parsed_filepath = os.path.join('parsed_documents', parsed_filename)
-            with open(parsed_filepath, 'w', encoding='utf-8') as f:
-                json.dump(parsed_content, f, indent=2, ensure_ascii=False)
+            _save_parsed_document(parsed_content, filename)
             
             # Index for search
-            search_engine.index_document(parsed_content, filename)
+            _index_document(parsed_content, filename)
             
             return jsonify({
                 'success': True,
@@ -91,13 +192,91 @@ def upload_file():
         except Exception as e:
             return jsonify({'error': f'Error parsing document: {str(e)}'}), 500
 
+@lru_cache(maxsize=1024)
+def _cached_search(query_norm, generation):
+    """
+    Search results for a normalized query at an index generation
+    
+    The caller passes search_engine.generation read before searching, so a search that
+    overlaps an index update is cached under the old generation and never served again.
+    """
+    return search_engine.search(query_norm)
+
+def _index_now(documents):
+    """Index (parsed_content, filename) pairs (runs on the indexer)"""
+    try:
+        search_engine.index_documents(documents)
+    except Exception as e:
+        print(f"Error indexing {len(documents)} document(s): {str(e)}")
+
+def _index_documents(documents):
+    """Queue (parsed_content, filename) pairs for indexing off the request thread"""
+    for document in documents:
+        _index_queue.put(document)
+
+def _index_document(parsed_content, filename):
+    """Queue a single parsed document for indexing off the request thread"""
+    _index_documents([(parsed_content, filename)])
+
+def _stored_documents():
+    """(parsed_content, filename) for every parsed document in the document index"""
+    documents = []
+    for parsed_filename, content in document_index.iter_documents():
+        # Parsed documents are named parsed_<upload filename>.json
+        filename = parsed_filename[len('parsed_'):-len('.json')] if parsed_filename.startswith('parsed_') else parsed_filename
+        documents.append((content, filename))
+    return documents
+
+def _rebuild_search_index():
+    """Re-index the stored parsed documents so search survives restarts"""
+    _index_now(_stored_documents())
+
+# document_index.external_writes as of the last search index rebuild; the lock keeps
+# concurrent searches from rebuilding for the same change
+_search_sync = {'external_writes': 0}
+_search_sync_lock = threading.Lock()
+
+def _sync_search_index():
+    """Rebuild this process's search index when another worker process has changed the stored documents"""
+    document_index.refresh()
+    if document_index.external_writes == _search_sync['external_writes']:
+        return
+    with _search_sync_lock:
+        external_writes = document_index.external_writes
+        if external_writes == _search_sync['external_writes']:
+            return
+        # Replacing drops documents other workers deleted; this process's queued uploads are
+        # already stored, and indexing them again when dequeued replaces rather than duplicates
+        try:
+            search_engine.replace_documents(_stored_documents())
+        except Exception as e:
+            print(f"Error rebuilding the search index: {str(e)}")
+            return
+        _search_sync['external_writes'] = external_writes
+
+def _index_worker():
+    """Rebuild the search index, then apply queued updates in batches of up to INDEX_BATCH_SIZE"""
+    _rebuild_search_index()
+    while True:
+        batch = [_index_queue.get()]
+        while len(batch) < INDEX_BATCH_SIZE:
+            try:
+                batch.append(_index_queue.get_nowait())
+            except queue.Empty:
+                break
+        _index_now(batch)
+
 @app.route('/search', methods=['GET'])
 def search_documents():
     query = request.args.get('q', '')
     if not query:
         return jsonify({'error': 'No search query provided'}), 400
     
-    results = search_engine.search(query)
+    # Pick up documents other worker processes stored or deleted since the last search
+    _sync_search_index()
+    
+    # Case and whitespace don't affect tokenization, so they share a cache entry
+    results = _cached_search(' '.join(query.lower().split()), search_engine.generation)
     return jsonify({
         'query': query,
         'results': results,
@@ -106,46 +285,28 @@ def search_documents():
 
 @app.route('/documents')
 def list_documents():
-    documents = []
+    # ?summary=1 returns only the job view, without per-document lists
+    summary_only = request.args.get('summary', '').strip().lower() in TRUTHY
+    documents = document_index.list_documents()
     jobs = {}
     
-    # Get all documents
-    for filename in os.listdir('parsed_documents'):
-        if filename.endswith('.json'):
-            filepath = os.path.join('parsed_documents', filename)
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-                
-                # Extract job ID from filename or metadata
-                job_id = content.get('job_id', 'unknown')
-                
-                document_info = {
-                    'filename': filename,
-                    'title': content.get('title', 'Untitled'),
-                    'upload_date': content.get('upload_date', 'Unknown'),
-                    'file_type': content.get('file_type', 'Unknown'),
-                    'job_id': job_id,
-                    'author': content.get('author', 'Not found'),
-                    'topic': content.get('topic', 'Not found'),
-                    'published_date': content.get('published_date', 'Not found'),
-                    'parser': content.get('parser', 'Unknown')
-                }
-                
-                documents.append(document_info)
-                
-                # Group by job ID
-                if job_id not in jobs:
-                    jobs[job_id] = {
-                        'job_id': job_id,
-                        'documents': [],
-                        'total_documents': 0,
-                        'successful_documents': 0,
-                        'upload_date': content.get('upload_date', 'Unknown')
-                    }
-                
-                jobs[job_id]['documents'].append(document_info)
-                jobs[job_id]['total_documents'] += 1
-                jobs[job_id]['successful_documents'] += 1
+    # Group indexed documents by job ID
+    for document_info in documents:
+        job_id = document_info['job_id']
+        job = jobs.get(job_id)
+        if job is None:
+            job = jobs[job_id] = {
+                'job_id': job_id,
+                'documents': [],
+                'total_documents': 0,
+                'successful_documents': 0,
+                'upload_date': document_info['upload_date']
+            }
+        
+        if not summary_only:
+            job['documents'].append(document_info)
+        job['total_documents'] += 1
+        job['successful_documents'] += 1
     
     # Get ALL jobs from job manager (including those without successful documents)
     all_jobs = job_manager.list_jobs()
@@ -188,6 +349,11 @@ def list_documents():
                 'data_source': job_summary.get('data_source', 'Local')
             }
     
+    if summary_only:
+        for job in jobs.values():
+            del job['documents']
+        return jsonify({'jobs': list(jobs.values())})
+    
     return jsonify({
         'documents': documents,
         'jobs': list(jobs.values())
@@ -195,14 +361,223 @@ def list_documents():
 
 @app.route('/document/<filename>')
 def get_document(filename):
-    filepath = os.path.join('parsed_documents', filename)
-    if not os.path.exists(filepath):
+    # Parsed documents never change after upload; serve the stored JSON from the document
+    # index with the ETag stored alongside it, so browsers revalidate (304 on a hit) without
+    # the body being hashed on every request
+    stored = document_index.get_content(filename)
+    if stored is None:
         return jsonify({'error': 'Document not found'}), 404
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = json.load(f)
+    content, etag = stored
+    response = app.response_class(content, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+def _save_parsed_document(parsed_content, filename):
+    """Store parsed content in the document index and return the parsed filename"""
+    parsed_filename = f"parsed_{filename}.json"
+    document_index.add(parsed_filename, parsed_content)
+    return parsed_filename
+
+def _parse_file(filepath, metadata_options, job_id):
+    """Parse a file, handing CPU-bound work to the process pool when one is configured"""
+    # GROBID-bound PDFs run up to GROBID_CONCURRENCY at once over the shared session. Routed on
+    # the detected MIME type, as validation is (memoized, so this doesn't run libmagic again),
+    # so a PDF without a .pdf extension still goes to GROBID
+    if _grobid_cache['available'] and detect_mime_type(filepath) == 'application/pdf':
+        return parser.parse_document(filepath, metadata_options, job_id)
     
-    return jsonify(content)
+    # Everything else is CPU-bound and limited to PARSE_WORKERS at a time
+    with _cpu_parse_slots:
+        if parse_process_pool is None:
+            return parser.parse_document(filepath, metadata_options, job_id)
+        return parse_process_pool.submit(parse_in_worker, filepath, metadata_options, job_id).result()
+
+def _requested_metadata_options(options):
+    """Known metadata options from a request, in request order without duplicates"""
+    if not isinstance(options, (list, tuple)):
+        return list(Config.DEFAULT_METADATA_OPTIONS)
+    available = Config.AVAILABLE_METADATA_SET
+    return list(dict.fromkeys(option for option in options if isinstance(option, str) and option in available))
+
+def _flag_value(value):
+    """A request flag as a bool: JSON booleans as given, anything else by its text (as TRUTHY)"""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUTHY
+
+def _options_key(metadata_options):
+    """Order-independent key for a set of metadata options and the parse settings, used by the parse caches"""
+    return f"{Config.CONFIG_HASH}:{','.join(sorted(metadata_options))}"
+
+def _file_sha256(filepath):
+    """Hex SHA-256 of a file, read in 1MB chunks"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _copy_parse(parsed_filename, job_id):
+    """Return an earlier parse re-stamped for a new job, or None if it is no longer indexed"""
+    parsed_content = document_index.get_document(parsed_filename) if parsed_filename else None
+    if parsed_content is not None:
+        parsed_content['job_id'] = job_id
+        parsed_content['upload_date'] = datetime.now().isoformat()
+    return parsed_content
+
+def _process_saved_file(filepath, filename, metadata_options, job_id):
+    """Validate, parse and store one saved file (runs on the parse worker pool)"""
+    doc_start_time = time.time()
+    try:
+        # Validate file first
+        is_valid, skip_reason, error_msg = parser.validate_file(filepath)
+        if not is_valid:
+            return {
+                'status': 'skipped',
+                'reason': skip_reason,
+                'message': error_msg,
+                'processing_time': time.time() - doc_start_time
+            }
+        
+        # Identical content parsed with the same options reuses the earlier parse. TXT files are
+        # skipped: they are cheap to parse and their title comes from the file name, not the content.
+        options_key = _options_key(metadata_options)
+        digest = None
+        if not filepath.lower().endswith('.txt'):
+            digest = _file_sha256(filepath)
+            parsed_content = _copy_parse(document_index.lookup_content_hash(digest, options_key), job_id)
+            if parsed_content is not None:
+                parsed_filename = _save_parsed_document(parsed_content, filename)
+                document_index.remember_content_hash(digest, options_key, parsed_filename)
+                # The upload is kept like any other: the job's results name it, and the copy is
+                # this job's own document, listed and deleted with it
+                return {
+                    'status': 'success',
+                    'parsed_content': parsed_content,
+                    'parsed_filename': parsed_filename,
+                    'processing_time': time.time() - doc_start_time
+                }
+        
+        # Parse the document with selected metadata options
+        parsed_content = _parse_file(filepath, metadata_options, job_id)
+        
+        # Save parsed content
+        parsed_filename = _save_parsed_document(parsed_content, filename)
+        # PyPDF2 results are only a stand-in while GROBID is down, so they aren't reused
+        if digest and parsed_content.get('parser') != 'PyPDF2':
+            document_index.remember_content_hash(digest, options_key, parsed_filename)
+        
+        return {
+            'status': 'success',
+            'parsed_content': parsed_content,
+            'parsed_filename': parsed_filename,
+            'processing_time': time.time() - doc_start_time
+        }
+    except Exception as e:
+        return {
+            'status': 'failed',
+            'error': str(e),
+            'processing_time': time.time() - doc_start_time
+        }
+
+def _save_upload(file, filepath):
+    """Copy an uploaded file to disk in large chunks (Werkzeug's save() copies 16KB at a time)"""
+    with open(filepath, 'wb', buffering=Config.UPLOAD_BUFFER_SIZE) as dst:
+        shutil.copyfileobj(file.stream, dst, length=Config.UPLOAD_BUFFER_SIZE)
+
+def _save_and_process_upload(file, filepath, filename, metadata_options, job_id):
+    """Save an uploaded file to disk and process it (runs on the parse worker pool)"""
+    try:
+        _save_upload(file, filepath)
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e), 'processing_time': 0.0}
+    return _process_saved_file(filepath, filename, metadata_options, job_id)
+
+def _record_file_outcome(job_id, results, original_filename, filename, outcome, metadata_options, to_index):
+    """Apply a processed file's outcome to the job, metrics and bulk results"""
+    if outcome['status'] == 'success':
+        parsed_content = outcome['parsed_content']
+        
+        # Collect for a single batched search-index update
+        to_index.append((parsed_content, filename))
+        
+        results['success_count'] += 1
+        results['successful_files'].append({
+            'filename': original_filename,
+            'title': parsed_content.get('title', 'Untitled'),
+            'extracted_metadata': {key: parsed_content.get(key, 'Not found') for key in metadata_options}
+        })
+        job_manager.add_file_result(job_id, original_filename, True, metadata=parsed_content)
+    elif outcome['status'] == 'skipped':
+        results['skipped_count'] += 1
+        results['skipped_files'].append({
+            'filename': original_filename,
+            'reason': outcome['reason'],
+            'message': outcome['message']
+        })
+        job_manager.add_file_result(job_id, original_filename, False, error=outcome['message'], skip_reason=outcome['reason'])
+    else:
+        results['error_count'] += 1
+        results['failed_files'].append(original_filename)
+        results['errors'].append(f"{original_filename}: {outcome['error']}")
+        job_manager.add_file_result(job_id, original_filename, False, error=outcome['error'])
+    
+    # Record document processing metrics
+    metrics_collector.record_document_processing(outcome['processing_time'], outcome['status'] == 'success')
+
+def _completed_future(outcome):
+    """Wrap an outcome that is already known so it can sit in the pending list with queued files"""
+    future = Future()
+    future.set_result(outcome)
+    return future
+
+def _save_upload_then_submit(file, filepath, filename, metadata_options, job_id):
+    """Save an upload on the request thread and queue it for parsing, returning its outcome future"""
+    try:
+        _save_upload(file, filepath)
+    except Exception as e:
+        return _completed_future({'status': 'failed', 'error': str(e), 'processing_time': 0.0})
+    return parse_executor.submit(_process_saved_file, filepath, filename, metadata_options, job_id)
+
+def _finish_bulk_job(job_id, results, pending, metadata_options):
+    """
+    Apply queued file outcomes in order, index the batch and complete the job
+    
+    Runs on the request thread, or on the job pool for async submissions.
+    pending holds (position, original_filename, filename, future) tuples.
+    """
+    try:
+        # Collect outcomes in submission order so job progress stays sequential
+        to_index = []
+        for position, original_filename, filename, future in pending:
+            job_manager.update_job_progress(job_id, original_filename, position, results['success_count'], results['error_count'])
+            _record_file_outcome(job_id, results, original_filename, filename, future.result(), metadata_options, to_index)
+        
+        # Index the whole batch for search in one update
+        _index_documents(to_index)
+        
+        # Update metrics with final job progress
+        metrics_collector.update_job_progress(job_id, results['success_count'], results['error_count'], results['skipped_count'])
+        
+        # Complete job
+        job_manager.complete_job(job_id, success=True)
+        
+        # Complete metrics collection for this job
+        metrics_collector.complete_job(job_id, success=True)
+    except Exception as e:
+        print(f"Error completing job {job_id}: {str(e)}")
+        job_manager.complete_job(job_id, success=False)
+        metrics_collector.complete_job(job_id, success=False)
+        raise
+    return results
+
+def _fail_unfinished_job(job_id):
+    """Mark a job failed when its request errors before _finish_bulk_job takes it over"""
+    # complete_job also closes the job's partial results file, which would otherwise stay open
+    job_manager.complete_job(job_id, success=False)
+    metrics_collector.complete_job(job_id, success=False)
 
 @app.route('/bulk_upload', methods=['POST'])
 def bulk_upload():
@@ -217,9 +592,9 @@ def bulk_upload():
     # Get metadata options
     metadata_options = request.form.get('metadata_options', '[]')
     try:
-        metadata_options = json.loads(metadata_options)
+        metadata_options = _requested_metadata_options(json.loads(metadata_options))
     except:
-        metadata_options = ['title', 'author', 'topic']  # Default options
+        metadata_options = list(Config.DEFAULT_METADATA_OPTIONS)
     
     # Create job
     job_id = job_manager.create_job(len(files), metadata_options, 'Local')
@@ -227,7 +602,6 @@ def bulk_upload():
     # Start metrics collection for this job
     metrics_collector.start_job(job_id, len(files))
     
-    # Process files asynchronously (in a real app, this would be a background task)
     results = {
         'job_id': job_id,
         'success_count': 0,
@@ -239,85 +613,45 @@ def bulk_upload():
         'errors': []
     }
     
-    for i, file in enumerate(files):
-        if file.filename == '':
-            continue
-        
-        # Extract just the filename from the path
-        original_filename = os.path.basename(file.filename) if '/' in file.filename else file.filename
-        
-        # Update job progress
-        job_manager.update_job_progress(job_id, original_filename, i + 1, results['success_count'], results['error_count'])
-        
-        # Start timing document processing
-        doc_start_time = time.time()
-        
-        try:
-            # Save uploaded file
-            filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{original_filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
-            # Validate file first
-            is_valid, skip_reason, error_msg = parser.validate_file(filepath)
-            
-            if not is_valid:
-                results['skipped_count'] += 1
-                results['skipped_files'].append({
-                    'filename': original_filename,
-                    'reason': skip_reason,
-                    'message': error_msg
-                })
-                job_manager.add_file_result(job_id, original_filename, False, error=error_msg, skip_reason=skip_reason)
-                
-                # Record document processing metrics
-                doc_processing_time = time.time() - doc_start_time
-                metrics_collector.record_document_processing(doc_processing_time, False)
+    # One timestamp and upload directory for the whole batch
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    upload_dir = app.config['UPLOAD_FOLDER']
+    run_async = _flag_value(request.form.get('async', ''))
+    
+    # Hand each upload to the parse pool so disk writes overlap with parsing of earlier files
+    pending = []
+    try:
+        for i, file in enumerate(files):
+            if file.filename == '':
                 continue
             
-            # Parse the document with selected metadata options
-            parsed_content = parser.parse_document(filepath, metadata_options, job_id)
-            
-            # Save parsed content
-            parsed_filename = f"parsed_{filename}.json"
-            parsed_filepath = os.path.join('parsed_documents', parsed_filename)
-            with open(parsed_filepath, 'w', encoding='utf-8') as f:
-                json.dump(parsed_content, f, indent=2, ensure_ascii=False)
-            
-            # Index for search
-            search_engine.index_document(parsed_content, filename)
-            
-            results['success_count'] += 1
-            results['successful_files'].append({
-                'filename': original_filename,
-                'title': parsed_content.get('title', 'Untitled'),
-                'extracted_metadata': {key: parsed_content.get(key, 'Not found') for key in metadata_options}
-            })
-            
-            job_manager.add_file_result(job_id, original_filename, True, metadata=parsed_content)
+            # Extract just the filename from the path (a no-op for plain names)
+            original_filename = os.path.basename(file.filename)
+            # The batch shares one timestamp, so the position keeps same-named files apart
+            filename = f"{timestamp}_{i:05d}_{original_filename}"
+            filepath = os.path.join(upload_dir, filename)
             
-            # Record successful document processing metrics
-            doc_processing_time = time.time() - doc_start_time
-            metrics_collector.record_document_processing(doc_processing_time, True)
-            
-        except Exception as e:
-            results['error_count'] += 1
-            results['failed_files'].append(original_filename)
-            results['errors'].append(f"{original_filename}: {str(e)}")
-            job_manager.add_file_result(job_id, original_filename, False, error=str(e))
-            
-            # Record failed document processing metrics
-            doc_processing_time = time.time() - doc_start_time
-            metrics_collector.record_document_processing(doc_processing_time, False)
-    
-    # Update metrics with final job progress
-    metrics_collector.update_job_progress(job_id, results['success_count'], results['error_count'], results['skipped_count'])
+            if run_async:
+                # The upload stream closes with the request, so save here and only parse in the background
+                future = _save_upload_then_submit(file, filepath, filename, metadata_options, job_id)
+            else:
+                future = parse_executor.submit(_save_and_process_upload, file, filepath, filename, metadata_options, job_id)
+            pending.append((i + 1, original_filename, filename, future))
+        
+        if run_async:
+            job_executor.submit(_finish_bulk_job, job_id, results, pending, metadata_options)
+    except Exception:
+        _fail_unfinished_job(job_id)
+        raise
     
-    # Complete job
-    job_manager.complete_job(job_id, success=True)
+    if run_async:
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': f'Bulk upload started. Poll /job_status/{job_id} for progress.'
+        }), 202
     
-    # Complete metrics collection for this job
-    metrics_collector.complete_job(job_id, success=True)
+    _finish_bulk_job(job_id, results, pending, metadata_options)
     
     return jsonify({
         'success': True,
@@ -347,7 +681,8 @@ def get_job_results(job_id):
 @app.route('/job_results/<job_id>/download')
 def download_job_results(job_id):
     """Download job results as JSONL file"""
-    job_status = job_manager.get_job_status(job_id)
+    # Only the status is needed here, not the file results get_job_status includes
+    job_status = job_manager.get_job(job_id)
     if not job_status:
         return jsonify({'error': 'Job not found'}), 404
     
@@ -355,18 +690,19 @@ def download_job_results(job_id):
         return jsonify({'error': 'Job not completed yet'}), 400
     
     jsonl_filename = f"job_{job_id}_results.jsonl"
-    jsonl_path = os.path.join('job_results', jsonl_filename)
+    jsonl_path = os.path.join(Config.JOB_RESULTS_FOLDER, jsonl_filename)
     
     if not os.path.exists(jsonl_path):
         return jsonify({'error': 'Job results file not found'}), 404
     
-    return send_from_directory('job_results', jsonl_filename, as_attachment=True)
+    # send_from_directory streams the file (sendfile where the server supports it) rather than loading it
+    return send_from_directory(Config.JOB_RESULTS_FOLDER, jsonl_filename, as_attachment=True, mimetype='application/x-ndjson')
 
 @app.route('/job_metadata/<filename>')
 def serve_job_metadata(filename):
     """Serve job metadata JSON files"""
     try:
-        return send_from_directory('job_metadata', filename)
+        return send_from_directory(Config.JOB_METADATA_FOLDER, filename)
     except FileNotFoundError:
         return jsonify({'error': 'Job metadata file not found'}), 404
 
@@ -379,10 +715,15 @@ def list_jobs():
 @app.route('/grobid_status')
 def grobid_status():
     """Check GROBID service status"""
-    is_available = parser.is_grobid_available()
+    now = time.monotonic()
+    if now - _grobid_cache['ts'] >= Config.GROBID_STATUS_TTL_SECONDS:
+        _grobid_cache['available'] = parser.is_grobid_available()
+        _grobid_cache['ts'] = now
+    
+    is_available = _grobid_cache['available']
     return jsonify({
         'available': is_available,
-        'url': parser.grobid_url,
+        'url': GROBID_URL,
         'message': 'GROBID service is available' if is_available else 'GROBID service is not available'
     })
 
@@ -407,8 +748,8 @@ def get_prometheus_metrics():
 @app.route('/jobs/<job_id>', methods=['DELETE'])
 def delete_job(job_id):
     """Delete a job and all related files (metadata, results, parsed documents)."""
-    # Check if job exists
-    job = job_manager.get_job_results(job_id)
+    # Check if job exists (its file results aren't needed for that)
+    job = job_manager.get_job(job_id)
     if not job:
         return jsonify({'error': 'Job not found'}), 404
 
@@ -419,8 +760,14 @@ def delete_job(job_id):
         'metrics_reset': False
     }
 
+    # Remove from in-memory manager first, so no pending metadata write recreates the files below
+    try:
+        job_manager.delete_job(job_id)
+    except Exception:
+        pass
+
     # Delete job metadata file
-    metadata_path = os.path.join('job_metadata', f"{job_id}.json")
+    metadata_path = os.path.join(Config.JOB_METADATA_FOLDER, f"{job_id}.json")
     if os.path.exists(metadata_path):
         try:
             os.remove(metadata_path)
@@ -429,7 +776,7 @@ def delete_job(job_id):
             pass
 
     # Delete job results JSONL file
-    results_path = os.path.join('job_results', f"job_{job_id}_results.jsonl")
+    results_path = os.path.join(Config.JOB_RESULTS_FOLDER, f"job_{job_id}_results.jsonl")
     if os.path.exists(results_path):
         try:
             os.remove(results_path)
@@ -437,31 +784,22 @@ def delete_job(job_id):
         except Exception:
             pass
 
-    # Delete parsed documents associated with this job
-    for json_path in glob.glob(os.path.join('parsed_documents', '*.json')):
+    # Remove the JSON files of the job's documents that were stored before the index held them
+    for parsed_filename in document_index.filenames_for_job(job_id):
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                content = json.load(f)
-            if content.get('job_id') == job_id:
-                try:
-                    os.remove(json_path)
-                    deleted['parsed_documents_deleted'] += 1
-                except Exception:
-                    pass
+            os.remove(os.path.join(Config.PARSED_DOCUMENTS_FOLDER, parsed_filename))
         except Exception:
-            # Skip unreadable files
-            continue
+            pass
 
-    # Remove from in-memory manager
+    # Delete the job's parsed documents from the document index
     try:
-        if job_id in job_manager.jobs:
-            del job_manager.jobs[job_id]
+        deleted['parsed_documents_deleted'] = document_index.remove_job(job_id)
     except Exception:
         pass
 
     # Check if this was the last job and reset metrics if so
     try:
-        if len(job_manager.jobs) == 0:
+        if job_manager.job_count() == 0:
             # No more jobs, reset metrics to clean state
             metrics_collector.reset_metrics()
             deleted['metrics_reset'] = True
@@ -470,6 +808,25 @@ def delete_job(job_id):
 
     return jsonify({'success': True, 'deleted': deleted})
 
+def _remove_files(directory, matches):
+    """Delete the regular files in a directory whose name passes matches(), returning the count removed"""
+    removed = 0
+    try:
+        entries = os.scandir(directory)
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            # Hidden files are skipped, as glob('*') did
+            if entry.name.startswith('.') or not entry.is_file() or not matches(entry.name):
+                continue
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except Exception:
+                pass
+    return removed
+
 @app.route('/jobs', methods=['DELETE'])
 def clear_all_jobs():
     """Delete all job history and related local files (does not touch S3)."""
@@ -482,46 +839,30 @@ def clear_all_jobs():
         'metrics_reset': False
     }
 
+    # Clear in-memory jobs first, so no pending metadata write recreates the files below
+    try:
+        summary['jobs_deleted'] = job_manager.clear_jobs()
+    except Exception:
+        pass
+
     # Delete all job metadata files
-    for path in glob.glob(os.path.join('job_metadata', '*.json')):
-        try:
-            os.remove(path)
-            summary['job_metadata_deleted'] += 1
-        except Exception:
-            pass
+    summary['job_metadata_deleted'] = _remove_files(Config.JOB_METADATA_FOLDER, lambda name: name.endswith('.json'))
 
     # Delete all job results files
-    for path in glob.glob(os.path.join('job_results', 'job_*_results.jsonl')):
-        try:
-            os.remove(path)
-            summary['job_results_deleted'] += 1
-        except Exception:
-            pass
+    summary['job_results_deleted'] = _remove_files(
+        Config.JOB_RESULTS_FOLDER, lambda name: name.startswith('job_') and name.endswith('_results.jsonl'))
 
-    # Delete all parsed documents (they are derived artifacts)
-    for path in glob.glob(os.path.join('parsed_documents', '*.json')):
-        try:
-            os.remove(path)
-            summary['parsed_documents_deleted'] += 1
-        except Exception:
-            pass
-
-    # Delete all uploaded files (local cache)
-    for path in glob.glob(os.path.join(Config.UPLOAD_FOLDER, '*')):
-        try:
-            if os.path.isfile(path):
-                os.remove(path)
-                summary['uploads_deleted'] += 1
-        except Exception:
-            pass
-
-    # Clear in-memory jobs
+    # Delete all parsed documents (they are derived artifacts), including any JSON files
+    # stored before the document index held them
+    _remove_files(Config.PARSED_DOCUMENTS_FOLDER, lambda name: name.endswith('.json'))
     try:
-        summary['jobs_deleted'] = len(job_manager.jobs)
-        job_manager.jobs.clear()
+        summary['parsed_documents_deleted'] = document_index.clear()
     except Exception:
         pass
 
+    # Delete all uploaded files (local cache)
+    summary['uploads_deleted'] = _remove_files(Config.UPLOAD_FOLDER, lambda name: True)
+
     # Reset metrics data
     try:
         metrics_collector.reset_metrics()
@@ -531,19 +872,29 @@ def clear_all_jobs():
 
     return jsonify({'success': True, 'summary': summary})
 
+# Extensions (without the dot) accepted from S3 listings; each file type label doubles as its extension
+_SUPPORTED_KEY_EXTENSIONS = frozenset(label.lower() for label in Config.SUPPORTED_FILE_LABELS)
+
 def _is_supported_key(key: str) -> bool:
-    key_lower = key.lower()
-    return key_lower.endswith('.pdf') or key_lower.endswith('.docx') or key_lower.endswith('.txt') or key_lower.endswith('.html')
+    # Only the extension is lowercased, not the whole key
+    _, dot, extension = key.rpartition('.')
+    return bool(dot) and extension.lower() in _SUPPORTED_KEY_EXTENSIONS
+
+# S3 clients keyed by credentials and region, so connection pools survive across requests
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+_S3_CLIENT_CACHE_LIMIT = 32
 
 def _make_boto3_client(aws_access_key_id=None, aws_secret_access_key=None, aws_region=None):
     if boto3 is None:
         raise RuntimeError('boto3 is not installed. Please install boto3 to use S3 upload.')
     session_kwargs = {}
     
-    # Use provided credentials or fall back to config
-    access_key = aws_access_key_id or Config.AWS_ACCESS_KEY_ID
-    secret_key = aws_secret_access_key or Config.AWS_SECRET_ACCESS_KEY
-    region = aws_region or Config.AWS_REGION
+    # Credentials given with the request are used as-is; otherwise botocore's default
+    # provider chain (environment, shared config, instance role) resolves and caches them
+    access_key = aws_access_key_id
+    secret_key = aws_secret_access_key
+    region = aws_region or Config.aws.region
     
     # Only add credentials if they are provided and not empty
     if access_key and secret_key and access_key.strip() and secret_key.strip():
@@ -551,19 +902,133 @@ def _make_boto3_client(aws_access_key_id=None, aws_secret_access_key=None, aws_r
             'aws_access_key_id': access_key,
             'aws_secret_access_key': secret_key,
         })
-        if Config.AWS_SESSION_TOKEN:
-            session_kwargs['aws_session_token'] = Config.AWS_SESSION_TOKEN
     
     if region:
         session_kwargs['region_name'] = region
     
-    # For public buckets, create client without credentials
-    if session_kwargs:
+    cache_key = tuple(sorted(session_kwargs.items()))
+    with _s3_clients_lock:
+        client = _s3_clients.get(cache_key)
+        if client is None:
+            if len(_s3_clients) >= _S3_CLIENT_CACHE_LIMIT:
+                _s3_clients.clear()
+            client = _s3_clients[cache_key] = _build_boto3_client(session_kwargs, region)
+    return client
+
+def _build_boto3_client(session_kwargs, region):
+    # Large enough for the download and listing pools plus multipart transfers
+    boto_config = BotoConfig(
+        signature_version='s3v4',
+        max_pool_connections=50,
+        retries={'max_attempts': 10, 'mode': 'adaptive'}
+    )
+    
+    if 'aws_access_key_id' in session_kwargs:
         session = boto3.session.Session(**session_kwargs)
-        return session.client('s3', config=BotoConfig(signature_version='s3v4'))
+        return session.client('s3', config=boto_config)
     else:
-        # For public buckets, use default client without credentials
-        return boto3.client('s3', region_name=region)
+        # No explicit credentials: the default session's credential chain applies
+        return boto3.client('s3', region_name=region, config=boto_config)
+
+def _supported_page_keys(page):
+    """Return (key, etag, size) for the supported documents in one list_objects_v2 page"""
+    return [(obj['Key'], obj.get('ETag', ''), obj.get('Size', 0)) for obj in page.get('Contents', [])
+            if not obj['Key'].endswith('/') and _is_supported_key(obj['Key'])]
+
+def _list_supported_keys(s3, bucket, prefix):
+    """
+    List (key, etag, size) for the supported documents under a prefix, in S3 key order
+    
+    The first level is listed with a delimiter, then each sub-prefix is paginated
+    on its own thread so deep trees aren't walked one 1000-key page at a time.
+    Listing stops early once more than S3_MAX_KEYS keys have been found.
+    """
+    pagination = {'PageSize': Config.S3_LIST_PAGE_SIZE}
+    keys = []
+    sub_prefixes = []
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix, Delimiter='/',
+                                                             PaginationConfig=pagination):
+        keys.extend(_supported_page_keys(page))
+        sub_prefixes.extend(common['Prefix'] for common in page.get('CommonPrefixes', []))
+
+    def list_sub_prefix(sub_prefix):
+        found = []
+        for page in s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=sub_prefix,
+                                                                 PaginationConfig=pagination):
+            found.extend(_supported_page_keys(page))
+            if len(found) > Config.S3_MAX_KEYS:
+                break
+        return found
+
+    if sub_prefixes:
+        with ThreadPoolExecutor(max_workers=min(Config.S3_LIST_WORKERS, len(sub_prefixes)),
+                                thread_name_prefix='docusearch-s3-list') as executor:
+            for found in executor.map(list_sub_prefix, sub_prefixes):
+                keys.extend(found)
+    return sorted(keys)
+
+def _reuse_s3_parse(bucket, key, etag, options_key, job_id):
+    """Copy the earlier parse of an unchanged S3 object into this job, or return None on a miss"""
+    if not etag:
+        return None
+    return _copy_parse(document_index.lookup_s3_object(bucket, key, etag, options_key), job_id)
+
+def _pick_s3_temp_dir():
+    """Use tmpfs for S3 downloads when it can hold every in-flight object, else the system temp dir"""
+    if Config.S3_TEMP_DIR:
+        return Config.S3_TEMP_DIR
+    try:
+        needed = Config.S3_DOWNLOAD_WORKERS * Config.MAX_FILE_SIZE_BYTES
+        if os.path.ismount('/dev/shm') and shutil.disk_usage('/dev/shm').free >= needed:
+            return '/dev/shm'
+    except OSError:
+        pass
+    return None
+
+S3_TEMP_DIR = _pick_s3_temp_dir()
+
+def _download_s3_object(s3, bucket, key, size, local_path):
+    """Download an S3 object to local_path"""
+    # download_file issues a HeadObject before every transfer; objects the listing already
+    # sized below the multipart threshold are fetched with one GET instead
+    if Config.S3_FETCH_METADATA or size is None or size >= S3_TRANSFER_CONFIG.multipart_threshold:
+        s3.download_file(bucket, key, local_path, Config=S3_TRANSFER_CONFIG)
+        return
+    body = s3.get_object(Bucket=bucket, Key=key)['Body']
+    try:
+        with open(local_path, 'wb') as f:
+            shutil.copyfileobj(body, f, Config.UPLOAD_BUFFER_SIZE)
+    finally:
+        body.close()
+
+def _download_and_process_key(s3, bucket, key, etag, size, original_filename, filename, metadata_options, job_id):
+    """Download one S3 object and process it on the parse pool (runs on the S3 download pool)"""
+    doc_start_time = time.time()
+    options_key = _options_key(metadata_options)
+    try:
+        # Unchanged objects (same ETag, same options) reuse their earlier parse instead of downloading again
+        parsed_content = _reuse_s3_parse(bucket, key, etag, options_key, job_id)
+        if parsed_content is not None:
+            parsed_filename = _save_parsed_document(parsed_content, filename)
+            document_index.remember_s3_object(bucket, key, etag, options_key, parsed_filename)
+            return {
+                'status': 'success',
+                'parsed_content': parsed_content,
+                'processing_time': time.time() - doc_start_time
+            }
+        
+        # One short-lived directory per object keeps the original basename (TXT titles use it)
+        # and is removed as soon as the object is parsed, so at most one file per download worker exists
+        with tempfile.TemporaryDirectory(prefix='s3_doc_', dir=S3_TEMP_DIR) as temp_dir:
+            local_path = os.path.join(temp_dir, original_filename)
+            _download_s3_object(s3, bucket, key, size, local_path)
+            outcome = parse_executor.submit(_process_saved_file, local_path, filename, metadata_options, job_id).result()
+        if outcome['status'] == 'success' and etag:
+            document_index.remember_s3_object(bucket, key, etag, options_key, outcome['parsed_filename'])
+        outcome['processing_time'] = time.time() - doc_start_time
+        return outcome
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e), 'processing_time': time.time() - doc_start_time}
 
 @app.route('/bulk_upload_s3', methods=['POST'])
 def bulk_upload_s3():
@@ -572,11 +1037,13 @@ def bulk_upload_s3():
         data = request.get_json(silent=True) or {}
         bucket = data.get('bucket') or Config.DEFAULT_S3_BUCKET
         prefix = data.get('prefix') or Config.DEFAULT_S3_PREFIX
-        metadata_options = data.get('metadata_options') or ['title', 'author', 'topic']
+        metadata_options = _requested_metadata_options(data.get('metadata_options') or Config.DEFAULT_METADATA_OPTIONS)
         aws_region = data.get('aws_region')
         aws_access_key_id = data.get('aws_access_key_id')
         aws_secret_access_key = data.get('aws_secret_access_key')
         is_public_bucket = data.get('is_public_bucket', False)
+        # "false" or "0" in JSON must not turn on background mode, as with the form field of /bulk_upload
+        run_async = _flag_value(data.get('async', False))
 
         if not bucket:
             return jsonify({'error': 'S3 bucket is required'}), 400
@@ -597,28 +1064,12 @@ def bulk_upload_s3():
 
     # Collect keys recursively
     try:
-        keys = []
-        continuation_token = None
-        while True:
-            list_kwargs = {
-                'Bucket': bucket,
-                'Prefix': prefix or '',
-                'MaxKeys': 1000,
-            }
-            if continuation_token:
-                list_kwargs['ContinuationToken'] = continuation_token
-            resp = s3.list_objects_v2(**list_kwargs)
-            for obj in resp.get('Contents', []):
-                key = obj['Key']
-                if not key.endswith('/') and _is_supported_key(key):
-                    keys.append(key)
-            if resp.get('IsTruncated'):
-                continuation_token = resp.get('NextContinuationToken')
-            else:
-                break
+        keys = _list_supported_keys(s3, bucket, prefix or '')
 
         if not keys:
             return jsonify({'error': 'No supported documents found in S3 location'}), 400
+        if len(keys) > Config.S3_MAX_KEYS:
+            return jsonify({'error': f'S3 location has more than {Config.S3_MAX_KEYS} supported documents. Please use a narrower prefix.'}), 400
     except ClientError as e:
         error_code = e.response['Error']['Code']
         if error_code == 'InvalidAccessKeyId':
@@ -649,88 +1100,40 @@ def bulk_upload_s3():
         'errors': []
     }
 
-    temp_dir = tempfile.mkdtemp(prefix='s3_docs_')
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    
+    # Downloads run ahead on the S3 pool while earlier objects are being parsed
+    pending = []
     try:
-        for idx, key in enumerate(keys, start=1):
+        for idx, (key, etag, size) in enumerate(keys, start=1):
             original_filename = os.path.basename(key)
-            job_manager.update_job_progress(job_id, original_filename, idx, results['success_count'], results['error_count'])
-            local_path = os.path.join(temp_dir, original_filename)
+            filename = f"{timestamp}_{idx:05d}_{original_filename}"
             
-            # Start timing document processing
-            doc_start_time = time.time()
+            # The listing already carries each object's size, so oversized objects are skipped without a download
+            is_valid, skip_reason, error_msg = parser.validate_size(size)
+            if not is_valid:
+                outcome = {'status': 'skipped', 'reason': skip_reason, 'message': error_msg, 'processing_time': 0.0}
+                pending.append((idx, original_filename, filename, _completed_future(outcome)))
+                continue
             
-            try:
-                # Download to temp
-                s3.download_file(bucket, key, local_path)
-
-                # Validate
-                is_valid, skip_reason, error_msg = parser.validate_file(local_path)
-                if not is_valid:
-                    results['skipped_count'] += 1
-                    results['skipped_files'].append({'filename': original_filename, 'reason': skip_reason, 'message': error_msg})
-                    job_manager.add_file_result(job_id, original_filename, False, error=error_msg, skip_reason=skip_reason)
-                    
-                    # Record document processing metrics
-                    doc_processing_time = time.time() - doc_start_time
-                    metrics_collector.record_document_processing(doc_processing_time, False)
-                    continue
-
-                # Parse
-                parsed_content = parser.parse_document(local_path, metadata_options, job_id)
-
-                # Save parsed JSON
-                timestamped_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{original_filename}"
-                parsed_filename = f"parsed_{timestamped_name}.json"
-                parsed_filepath = os.path.join('parsed_documents', parsed_filename)
-                with open(parsed_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(parsed_content, f, indent=2, ensure_ascii=False)
-
-                # Index
-                search_engine.index_document(parsed_content, timestamped_name)
-
-                results['success_count'] += 1
-                results['successful_files'].append({
-                    'filename': original_filename,
-                    'title': parsed_content.get('title', 'Untitled'),
-                    'extracted_metadata': {key: parsed_content.get(key, 'Not found') for key in metadata_options}
-                })
-                job_manager.add_file_result(job_id, original_filename, True, metadata=parsed_content)
-                
-                # Record successful document processing metrics
-                doc_processing_time = time.time() - doc_start_time
-                metrics_collector.record_document_processing(doc_processing_time, True)
-                
-            except Exception as e:
-                results['error_count'] += 1
-                results['failed_files'].append(original_filename)
-                results['errors'].append(f"{original_filename}: {str(e)}")
-                job_manager.add_file_result(job_id, original_filename, False, error=str(e))
-                
-                # Record failed document processing metrics
-                doc_processing_time = time.time() - doc_start_time
-                metrics_collector.record_document_processing(doc_processing_time, False)
-                
-            finally:
-                # Per-file cleanup
-                if os.path.exists(local_path):
-                    try:
-                        os.remove(local_path)
-                    except Exception:
-                        pass
-    finally:
-        # Remove temp directory
-        try:
-            shutil.rmtree(temp_dir, ignore_errors=True)
-        except Exception:
-            pass
-
-    # Update metrics with final job progress
-    metrics_collector.update_job_progress(job_id, results['success_count'], results['error_count'], results['skipped_count'])
+            future = s3_download_executor.submit(_download_and_process_key, s3, bucket, key, etag, size,
+                                                 original_filename, filename, metadata_options, job_id)
+            pending.append((idx, original_filename, filename, future))
+        
+        if run_async:
+            job_executor.submit(_finish_bulk_job, job_id, results, pending, metadata_options)
+    except Exception:
+        _fail_unfinished_job(job_id)
+        raise
     
-    job_manager.complete_job(job_id, success=True)
+    if run_async:
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'message': f'S3 processing started. Poll /job_status/{job_id} for progress.'
+        }), 202
     
-    # Complete metrics collection for this job
-    metrics_collector.complete_job(job_id, success=True)
+    _finish_bulk_job(job_id, results, pending, metadata_options)
 
     return jsonify({
         'success': True,
@@ -739,5 +1142,9 @@ def bulk_upload_s3():
         'results': results
     })
 
+# Not in parse worker processes, which re-import this module as __mp_main__ when it is run as a script
+if __name__ != '__mp_main__':
+    _init_server()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
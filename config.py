@@ -2,26 +2,123 @@
 Configuration settings for DocuSearch application
 """
 
+import hashlib
 import os
 
-class Config:
+# Read the environment through one mapping instead of an os.getenv call per setting
+_E = os.environ
+
+
+def _get(name, default=None, cast=str):
+    """Return environment variable `name` converted with `cast`, or `default` when it is unset"""
+    value = _E.get(name)
+    if value is None:
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        # Fail at import with the variable's name rather than a bare int() error
+        raise ValueError(f"Invalid value for environment variable {name}: {value!r}") from None
+
+
+# Strings accepted as "on" by every boolean toggle (environment, query and form values)
+TRUTHY = frozenset({'1', 'true', 'yes', 'on', 't', 'y'})
+
+
+def _clamp(value, low, high=None):
+    """Limit a numeric setting to [low, high] so a bad value can't stall or exhaust a pool"""
+    value = max(low, value)
+    return value if high is None else min(value, high)
+
+
+def _flag(value):
+    """Interpret an environment string as a boolean toggle"""
+    return value.strip().lower() in TRUTHY
+
+
+class _LazyEnv:
+    """Namespace of environment variables that are read on first access and then memoized"""
+
+    def __init__(self, **variables):
+        # attribute name -> environment variable name
+        self._variables = variables
+
+    def __getattr__(self, name):
+        try:
+            env_name = self._variables[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        value = self.__dict__[name] = _E.get(env_name)
+        return value
+
+
+class _FrozenConfig(type):
+    """Metaclass that makes a configuration class read-only once its body has run"""
+
+    def __setattr__(cls, name, value):
+        raise AttributeError(f"{cls.__name__}.{name} is read-only; set it through the environment instead")
+
+    def __delattr__(cls, name):
+        raise AttributeError(f"{cls.__name__}.{name} is read-only")
+
+
+class Config(metaclass=_FrozenConfig):
     """Application configuration class"""
     
     # File processing limits
-    MAX_FILE_SIZE_MB = int(os.getenv('MAX_FILE_SIZE_MB', 50))  # Default 50MB
-    MAX_PAGES_PER_DOCUMENT = int(os.getenv('MAX_PAGES_PER_DOCUMENT', 500))  # Default 500 pages
+    MAX_FILE_SIZE_MB = _clamp(_get('MAX_FILE_SIZE_MB', 50, int), 1)  # Default 50MB
+    MAX_PAGES_PER_DOCUMENT = _clamp(_get('MAX_PAGES_PER_DOCUMENT', 500, int), 1)  # Default 500 pages
+    MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
     
     # File upload settings
     UPLOAD_FOLDER = 'uploads'
     PARSED_DOCUMENTS_FOLDER = 'parsed_documents'
     JOB_RESULTS_FOLDER = 'job_results'
+    JOB_METADATA_FOLDER = 'job_metadata'
+    DATA_FOLDERS = (UPLOAD_FOLDER, PARSED_DOCUMENTS_FOLDER, JOB_RESULTS_FOLDER, JOB_METADATA_FOLDER)
+    DOCUMENT_INDEX_PATH = os.path.join(PARSED_DOCUMENTS_FOLDER, 'document_index.db')
     
     # Flask settings
-    MAX_CONTENT_LENGTH = MAX_FILE_SIZE_MB * 1024 * 1024  # Convert MB to bytes
+    MAX_CONTENT_LENGTH = MAX_FILE_SIZE_BYTES
+    
+    # Chunk size used when copying uploaded files to disk
+    UPLOAD_BUFFER_SIZE = 1024 * 1024
+    
+    # Each uploaded file is buffered in memory up to this size while the request is parsed,
+    # then spilled to a temporary file, so peak memory doesn't scale with the upload size
+    STREAM_UPLOAD_THRESHOLD = 1024 * 1024
+    
+    # Let the front-end server send downloaded files (X-Sendfile header) instead of the Python worker.
+    # Only enable behind a server that handles X-Sendfile (e.g. Apache mod_xsendfile, lighttpd).
+    USE_X_SENDFILE = _get('DOCUSEARCH_USE_X_SENDFILE', False, _flag)
     
     # Search settings
     SEARCH_RESULTS_LIMIT = 50
     
+    # Seconds a GROBID availability probe is reused by /grobid_status
+    GROBID_STATUS_TTL_SECONDS = _clamp(_get('GROBID_STATUS_TTL_SECONDS', 10, int), 0)
+    
+    # Worker pool used by bulk uploads to validate/parse files in parallel
+    PARSE_WORKERS = _clamp(_get('DOCUSEARCH_PARSE_WORKERS', 4, int), 1)
+    
+    # Background threads that run bulk jobs submitted with async=true
+    JOB_WORKERS = _clamp(_get('DOCUSEARCH_JOB_WORKERS', 2, int), 1)
+    
+    # PDFs sent to GROBID at once; these calls mostly wait on the network, so they get
+    # their own limit instead of sharing PARSE_WORKERS with CPU-bound parsing
+    GROBID_CONCURRENCY = _clamp(_get('GROBID_CONCURRENCY', 16, int), 1)
+    
+    # Retries when GROBID answers 503 (busy), waiting GROBID_RETRY_BACKOFF_SECONDS and doubling each time
+    GROBID_BUSY_RETRIES = _clamp(_get('GROBID_BUSY_RETRIES', 3, int), 0)
+    GROBID_RETRY_BACKOFF_SECONDS = 0.5
+    
+    # Processes for CPU-bound parsing (non-PDFs, and PDFs when GROBID is down).
+    # 0 parses on the worker threads; at most PARSE_WORKERS of them are busy at once.
+    PARSE_PROCESSES = _clamp(_get('DOCUSEARCH_PARSE_PROCESSES', 0, int), 0)
+    
+    # Keep-alive connections held open to GROBID (one per concurrent GROBID call by default)
+    GROBID_POOL_SIZE = _clamp(_get('GROBID_POOL_SIZE', GROBID_CONCURRENCY, int), 1)
+    
     # Supported file types
     SUPPORTED_FILE_TYPES = {
         'application/pdf': 'PDF',
@@ -29,39 +126,49 @@ class Config:
         'text/plain': 'TXT',
         'text/html': 'HTML'
     }
+    SUPPORTED_MIME_SET = frozenset(SUPPORTED_FILE_TYPES)
+    SUPPORTED_FILE_LABELS = tuple(SUPPORTED_FILE_TYPES.values())
     
     # Metadata extraction options
-    AVAILABLE_METADATA_OPTIONS = [
+    AVAILABLE_METADATA_OPTIONS = (
         'title',
-        'author', 
+        'author',
         'published_date',
         'topic',
         'abstract'
-    ]
+    )
+    AVAILABLE_METADATA_SET = frozenset(AVAILABLE_METADATA_OPTIONS)
+    DEFAULT_METADATA_OPTIONS = ('title', 'author', 'topic')
+    
+    # Fingerprint of the settings that change what a parse produces; caches of parsed
+    # documents include it in their keys so a config change invalidates them
+    CONFIG_HASH = hashlib.blake2b(
+        repr((MAX_FILE_SIZE_MB, MAX_PAGES_PER_DOCUMENT, sorted(SUPPORTED_FILE_TYPES.items()))).encode(),
+        digest_size=8
+    ).hexdigest()
 
-    # AWS / S3 settings (override via environment variables)
-    AWS_REGION = os.getenv('AWS_REGION', None)
-    AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID', None)
-    AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY', None)
-    AWS_SESSION_TOKEN = os.getenv('AWS_SESSION_TOKEN', None)
+    # AWS / S3 settings (override via environment variables); only read when S3 is used.
+    # Credentials aren't kept here: boto3's default provider chain reads AWS_ACCESS_KEY_ID,
+    # AWS_SECRET_ACCESS_KEY and AWS_SESSION_TOKEN itself.
+    aws = _LazyEnv(region='AWS_REGION')
 
     # Default S3 parameters (UI can override per request)
-    DEFAULT_S3_BUCKET = os.getenv('DOCUSEARCH_S3_BUCKET', '')
-    DEFAULT_S3_PREFIX = os.getenv('DOCUSEARCH_S3_PREFIX', '')
-    S3_MAX_KEYS = int(os.getenv('DOCUSEARCH_S3_MAX_KEYS', '10000'))
+    DEFAULT_S3_BUCKET = _get('DOCUSEARCH_S3_BUCKET', '')
+    DEFAULT_S3_PREFIX = _get('DOCUSEARCH_S3_PREFIX', '')
+    S3_MAX_KEYS = _clamp(_get('DOCUSEARCH_S3_MAX_KEYS', 10000, int), 1)
     
-    @classmethod
-    def get_max_file_size_bytes(cls):
-        """Get maximum file size in bytes"""
-        return cls.MAX_FILE_SIZE_MB * 1024 * 1024
+    # Threads listing sub-prefixes in parallel when collecting S3 keys
+    S3_LIST_WORKERS = _clamp(_get('DOCUSEARCH_S3_LIST_WORKERS', 8, int), 1)
     
-    @classmethod
-    def get_max_file_size_mb(cls):
-        """Get maximum file size in MB"""
-        return cls.MAX_FILE_SIZE_MB
+    # Keys requested per ListObjectsV2 call (S3 never returns more than 1000)
+    S3_LIST_PAGE_SIZE = _clamp(_get('DOCUSEARCH_S3_PAGE_SIZE', 1000, int), 1, 1000)
     
-    @classmethod
-    def get_max_pages(cls):
-        """Get maximum pages per document"""
-        return cls.MAX_PAGES_PER_DOCUMENT
-
+    # Objects downloaded ahead of the parse workers during S3 imports
+    S3_DOWNLOAD_WORKERS = _clamp(_get('DOCUSEARCH_S3_DOWNLOAD_WORKERS', 8, int), 1)
+    
+    # Ask S3 for each object's metadata (HeadObject) before downloading it. Off by default: the
+    # listing already carries Size and ETag, so small objects are fetched with a single GET.
+    S3_FETCH_METADATA = _get('DOCUSEARCH_S3_FETCH_METADATA', False, _flag)
+    
+    # Where S3 objects are downloaded before parsing (unset: /dev/shm when it has room, else the system temp dir)
+    S3_TEMP_DIR = _get('DOCUSEARCH_S3_TEMP_DIR') or None
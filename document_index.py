@@ -0,0 +1,273 @@
+"""
+Document index for DocuSearch
+Stores every parsed document in SQLite, the single copy that listings, lookups and downloads read
+"""
+
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to compact JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, default=str)
+
+
+def _etag(content: str) -> str:
+    """Strong ETag for a stored document body, computed once when the document is written"""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+def _loads(data) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class DocumentIndex:
+    """SQLite-backed index of parsed document summaries and contents"""
+
+    def __init__(self, db_path: str = None, documents_dir: str = None):
+        """
+        Open (or create) the index and import parsed documents left on disk as JSON files
+
+        Args:
+            db_path: Path to the SQLite database file
+            documents_dir: Directory holding JSON files written before documents lived in the index
+        """
+        self.documents_dir = documents_dir or Config.PARSED_DOCUMENTS_FOLDER
+        self.db_path = db_path or Config.DOCUMENT_INDEX_PATH
+        os.makedirs(self.documents_dir, exist_ok=True)
+
+        self.lock = threading.Lock()
+        self._summaries: Dict[str, Dict[str, Any]] = {}
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+        # Pick up documents written as files before the index held them (or restored from a backup)
+        self._sync_with_disk()
+
+        # In-memory copy of the summaries, kept in rowid order, so listings skip SQLite while no
+        # other process writes. data_version changes only when another connection commits, so
+        # comparing it tells when another worker process has changed the table.
+        self.external_writes = 0
+        with self.lock:
+            self._load_summaries_locked()
+
+    def _load_summaries_locked(self):
+        """Reload the in-memory summaries from the table; caller must hold self.lock"""
+        self._data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        rows = self.conn.execute('SELECT filename, summary FROM documents ORDER BY rowid').fetchall()
+        self._summaries = {filename: _loads(summary) for filename, summary in rows}
+
+    def refresh(self) -> bool:
+        """
+        Reload the summaries if another process has written to the index since the last check
+
+        Returns True when it had, after bumping external_writes; callers holding their own
+        per-process view of the documents (such as a search index) compare that counter.
+        """
+        with self.lock:
+            if self.conn.execute('PRAGMA data_version').fetchone()[0] == self._data_version:
+                return False
+            self._load_summaries_locked()
+            self.external_writes += 1
+            return True
+
+    def _create_schema(self):
+        """Create the documents table and its job_id index"""
+        with self.conn:
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS documents ('
+                'filename TEXT PRIMARY KEY, '
+                'job_id TEXT, '
+                'upload_date TEXT, '
+                'summary TEXT NOT NULL, '
+                'content TEXT NOT NULL, '
+                'etag TEXT NOT NULL)'
+            )
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_documents_job_id ON documents (job_id)')
+
+            # Parsed document produced for each S3 object version, so unchanged objects aren't re-parsed
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS s3_objects ('
+                'bucket TEXT NOT NULL, '
+                'key TEXT NOT NULL, '
+                'etag TEXT NOT NULL, '
+                'options TEXT NOT NULL, '
+                'filename TEXT NOT NULL, '
+                'PRIMARY KEY (bucket, key, etag, options))'
+            )
+
+            # Parsed document produced for each file content hash, so identical re-uploads aren't re-parsed
+            self.conn.execute(
+                'CREATE TABLE IF NOT EXISTS content_hashes ('
+                'digest TEXT NOT NULL, '
+                'options TEXT NOT NULL, '
+                'filename TEXT NOT NULL, '
+                'PRIMARY KEY (digest, options))'
+            )
+
+    # Listing fields copied from parsed content, with the default used when a field is missing
+    SUMMARY_FIELDS = (
+        ('title', 'Untitled'),
+        ('upload_date', 'Unknown'),
+        ('file_type', 'Unknown'),
+        ('job_id', 'unknown'),
+        ('author', 'Not found'),
+        ('topic', 'Not found'),
+        ('published_date', 'Not found'),
+        ('parser', 'Unknown'),
+    )
+
+    @classmethod
+    def build_summary(cls, filename: str, content: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the listing summary for a parsed document"""
+        get = content.get
+        summary = {'filename': filename}
+        for field, default in cls.SUMMARY_FIELDS:
+            summary[field] = get(field, default)
+        return summary
+
+    def add(self, filename: str, content: Dict[str, Any]):
+        """Insert or replace the summary, content and content ETag for a parsed document"""
+        summary = self.build_summary(filename, content)
+        body = _dumps(content)
+        row = (
+            filename,
+            summary['job_id'],
+            summary['upload_date'],
+            _dumps(summary),
+            body,
+            _etag(body)
+        )
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO documents (filename, job_id, upload_date, summary, content, etag) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                row
+            )
+            # A replaced row gets a new rowid, so move it to the end here as well
+            self._summaries.pop(filename, None)
+            self._summaries[filename] = summary
+
+    def remove(self, filename: str):
+        """Remove a document from the index"""
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM documents WHERE filename = ?', (filename,))
+            self._summaries.pop(filename, None)
+
+    def remove_job(self, job_id: str) -> int:
+        """Remove every document belonging to a job, returning the number removed"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM documents WHERE job_id = ?', (job_id,))
+            self._summaries = {
+                filename: summary for filename, summary in self._summaries.items() if summary['job_id'] != job_id
+            }
+            return cursor.rowcount
+
+    def filenames_for_job(self, job_id: str) -> List[str]:
+        """Return the parsed document filenames that belong to a job"""
+        with self.lock:
+            rows = self.conn.execute('SELECT filename FROM documents WHERE job_id = ?', (job_id,)).fetchall()
+        return [filename for (filename,) in rows]
+
+    def clear(self) -> int:
+        """Remove every document from the index, returning the number removed"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute('DELETE FROM documents')
+            self._summaries = {}
+            return cursor.rowcount
+
+    def list_documents(self) -> List[Dict[str, Any]]:
+        """Return the summaries of all indexed documents in insertion order"""
+        self.refresh()
+        with self.lock:
+            return list(self._summaries.values())
+
+    def get_content(self, filename: str) -> Optional[Tuple[str, str]]:
+        """Return the stored JSON for a parsed document and its ETag, or None if it isn't indexed"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content, etag FROM documents WHERE filename = ?', (filename,)
+            ).fetchone()
+        return row
+
+    def get_document(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Return the parsed content of a document, or None if it isn't indexed"""
+        row = self.get_content(filename)
+        return _loads(row[0]) if row is not None else None
+
+    def iter_documents(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (filename, parsed content) for every stored document in insertion order"""
+        with self.lock:
+            rows = self.conn.execute('SELECT filename, content FROM documents ORDER BY rowid').fetchall()
+        for filename, content in rows:
+            yield filename, _loads(content)
+
+    def lookup_s3_object(self, bucket: str, key: str, etag: str, options: str) -> Optional[str]:
+        """Return the parsed filename recorded for an S3 object version, if it is still indexed"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT s.filename FROM s3_objects s JOIN documents d ON d.filename = s.filename '
+                'WHERE s.bucket = ? AND s.key = ? AND s.etag = ? AND s.options = ?',
+                (bucket, key, etag, options)
+            ).fetchone()
+        return row[0] if row else None
+
+    def remember_s3_object(self, bucket: str, key: str, etag: str, options: str, filename: str):
+        """Record the parsed filename produced for an S3 object version"""
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO s3_objects VALUES (?, ?, ?, ?, ?)',
+                              (bucket, key, etag, options, filename))
+
+    def lookup_content_hash(self, digest: str, options: str) -> Optional[str]:
+        """Return the parsed filename recorded for a file content hash, if it is still indexed"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT c.filename FROM content_hashes c JOIN documents d ON d.filename = c.filename '
+                'WHERE c.digest = ? AND c.options = ?',
+                (digest, options)
+            ).fetchone()
+        return row[0] if row else None
+
+    def remember_content_hash(self, digest: str, options: str, filename: str):
+        """Record the parsed filename produced for a file content hash"""
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO content_hashes VALUES (?, ?, ?)', (digest, options, filename))
+
+    def _sync_with_disk(self):
+        """
+        Import parsed document JSON files that aren't stored in the table yet
+
+        Documents used to be written as files in documents_dir; the table is now their only
+        copy, so rows are kept whether or not a file exists.
+        """
+        with os.scandir(self.documents_dir) as entries:
+            on_disk = {entry.name for entry in entries if entry.name.endswith('.json') and entry.is_file()}
+        with self.lock:
+            indexed = {name for (name,) in self.conn.execute('SELECT filename FROM documents')}
+
+        for filename in sorted(on_disk - indexed):
+            try:
+                with open(os.path.join(self.documents_dir, filename), 'rb') as f:
+                    self.add(filename, _loads(f.read()))
+            except Exception as e:
+                print(f"Error indexing parsed document {filename}: {str(e)}")
+
+# Global document index instance
+document_index = DocumentIndex()
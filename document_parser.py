@@ -2,14 +2,191 @@
 Document Parser with GROBID integration for enhanced PDF parsing
 """
 
+import io
 import os
+import re
 import json
+import mmap
+import time
 import magic
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional, Any
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, List, Tuple, Optional, Any, Iterator
 from config import Config
 
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
+try:
+    from lxml import etree as ET  # C parser, much faster on large fulltext TEI
+except ImportError:
+    from xml.etree import ElementTree as ET
+
+# Element paths into GROBID's TEI output, built once instead of spelled out per lookup
+_TEI = '{http://www.tei-c.org/ns/1.0}'
+TEI_TITLE = f'.//{_TEI}titleStmt/{_TEI}title'
+TEI_AUTHORS = f'.//{_TEI}sourceDesc/{_TEI}biblStruct/{_TEI}analytic/{_TEI}author'
+TEI_FORENAME = f'.//{_TEI}forename'
+TEI_SURNAME = f'.//{_TEI}surname'
+TEI_ABSTRACT = f'.//{_TEI}profileDesc/{_TEI}abstract'
+TEI_DATE = f'.//{_TEI}sourceDesc/{_TEI}biblStruct/{_TEI}monogr/{_TEI}imprint/{_TEI}date'
+TEI_KEYWORDS = f'.//{_TEI}profileDesc/{_TEI}textClass/{_TEI}keywords/{_TEI}term'
+TEI_BODY = f'.//{_TEI}text/{_TEI}body'
+TEI_DIV = f'.//{_TEI}div'
+TEI_HEAD = f'.//{_TEI}head'
+TEI_REFERENCES = f'.//{_TEI}listBibl/{_TEI}biblStruct'
+TEI_HEADER_TAG = f'{_TEI}teiHeader'
+
+# Direct child paths from a teiHeader element, so lookups follow one branch instead of scanning the subtree
+HEADER_TITLE = f'{_TEI}fileDesc/{_TEI}titleStmt/{_TEI}title'
+HEADER_BIBL = f'{_TEI}fileDesc/{_TEI}sourceDesc/{_TEI}biblStruct'
+HEADER_PROFILE = f'{_TEI}profileDesc'
+BIBL_AUTHORS = f'{_TEI}analytic/{_TEI}author'
+BIBL_DATE = f'{_TEI}monogr/{_TEI}imprint/{_TEI}date'
+PROFILE_ABSTRACT = f'{_TEI}abstract'
+PROFILE_KEYWORDS = f'{_TEI}textClass/{_TEI}keywords/{_TEI}term'
+
+
+def _read_tei_header(data: bytes):
+    """Parse GROBID TEI only up to the end of its teiHeader, without building the (much larger) body"""
+    for _, elem in ET.iterparse(io.BytesIO(data), events=('end',)):
+        if elem.tag == TEI_HEADER_TAG:
+            return elem
+    raise ValueError('GROBID response has no teiHeader')
+
+
+@lru_cache(maxsize=256)
+def _mime_type_for(filepath: str, mtime_ns: int, size: int) -> str:
+    return magic.from_file(filepath, mime=True)
+
+
+def detect_mime_type(filepath: str, st: os.stat_result = None) -> str:
+    """
+    MIME type of a file, detected with libmagic
+    
+    Memoized on (path, mtime, size), so validating and then parsing the same
+    file runs libmagic once, while a file rewritten in place is detected again.
+    Pass `st` when the file has already been stat'ed.
+    """
+    if st is None:
+        st = os.stat(filepath)
+    return _mime_type_for(filepath, st.st_mtime_ns, st.st_size)
+
+
+_AUTHOR_SEPARATOR = re.compile(r'[;,]')
+
+
+def _author_from_name(name: str) -> Dict[str, str]:
+    """Split a 'First [Middle] Last' name; a single word is treated as the last name"""
+    name_parts = name.split()
+    if len(name_parts) >= 2:
+        return {'first_name': ' '.join(name_parts[:-1]), 'last_name': name_parts[-1], 'full_name': name}
+    return {'first_name': '', 'last_name': name, 'full_name': name}
+
+
+def _parse_author_string(text: Optional[str]) -> List[Dict[str, str]]:
+    """Parse an author field holding names separated by ';' or ','"""
+    if not text:
+        return []
+    return [_author_from_name(part) for part in map(str.strip, _AUTHOR_SEPARATOR.split(text)) if part]
+
+
+class _HTMLTitleExtractor(HTMLParser):
+    """Collects the text of the first <title> element without building a document tree"""
+    
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self.in_title = False
+        self.done = False
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title' and not self.done:
+            self.in_title = True
+    
+    def handle_endtag(self, tag):
+        if tag == 'title' and self.in_title:
+            self.in_title = False
+            self.done = True
+    
+    def handle_data(self, data):
+        if self.in_title:
+            self.parts.append(data)
+
+
+# Start of a `field = {value}` entry of a BibTeX record; the value runs to the matching closing brace
+_BIBTEX_FIELD = re.compile(r'^\s*(title|author|year|doi)\s*=\s*\{', re.MULTILINE)
+_BIBTEX_BRACE = re.compile(r'[{}]')
+
+
+def _bibtex_fields(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    (field, value) for the title/author/year/doi entries of a BibTeX record
+    
+    Values may span lines and contain nested braces, which are kept; whitespace is collapsed.
+    """
+    pos = 0
+    while True:
+        match = _BIBTEX_FIELD.search(text, pos)
+        if match is None:
+            return
+        depth = 1
+        for brace in _BIBTEX_BRACE.finditer(text, match.end()):
+            depth += 1 if brace.group() == '{' else -1
+            if depth == 0:
+                break
+        else:
+            # Unbalanced braces: the rest of the record can't be split into fields
+            return
+        yield match.group(1), ' '.join(text[match.end():brace.start()].split())
+        pos = brace.end()
+
+
+# (whole second, its ISO string) for the most recent upload_date; replaced as one tuple so threads never see a torn pair
+_now_cache = (0, '')
+
+
+def _now_iso() -> str:
+    """Current local time as an ISO string at second resolution, formatted once per second"""
+    global _now_cache
+    second = int(time.time())
+    cached_second, text = _now_cache
+    if second != cached_second:
+        text = datetime.fromtimestamp(second).isoformat()
+        _now_cache = (second, text)
+    return text
+
+
+def _fill_missing_fields(result: Dict[str, Any], metadata_options: List[str]):
+    """Give every requested field the parser didn't find an empty value ([] for author)"""
+    for field in metadata_options:
+        if field not in result:
+            result[field] = [] if field == 'author' else ''
+
+
+_PDF_PAGE_OBJECT = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+
+def _scan_pdf_page_count(filepath: str) -> Optional[int]:
+    """
+    Count a PDF's pages by scanning its bytes for page objects, without building an xref table
+    
+    Only trusted for single-revision PDFs without object streams or encryption, where every
+    page object appears exactly once in plain text. Returns None otherwise (or when no page
+    is found), and the caller falls back to PyPDF2.
+    """
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm.find(b'/ObjStm') != -1 or mm.find(b'/Encrypt') != -1 or mm.find(b'/Prev') != -1:
+            return None
+        count = sum(1 for _ in _PDF_PAGE_OBJECT.finditer(mm))
+    return count or None
+
 
 class DocumentParser:
     """Enhanced document parser using GROBID for PDF processing and fallback libraries for other formats"""
@@ -24,6 +201,62 @@ class DocumentParser:
         self.grobid_url = grobid_url
         self.supported_types = Config.SUPPORTED_FILE_TYPES
         
+        # File type label -> parse method
+        self._parsers = {
+            'PDF': self._parse_pdf_with_grobid,
+            'DOCX': self._parse_docx,
+            'TXT': self._parse_txt,
+            'HTML': self._parse_html
+        }
+        
+        # Shared session so GROBID requests reuse keep-alive connections
+        self.session = requests.Session()
+        # Ask for TEI explicitly; some GROBID versions otherwise answer with BibTeX
+        self.session.headers['Accept'] = 'application/xml'
+        self._mount_adapter(Config.GROBID_POOL_SIZE)
+    
+    def _mount_adapter(self, pool_size: int):
+        """Size the session's connection pool for the given number of concurrent requests"""
+        # max_retries only re-attempts failed connections, never a request GROBID already received
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=3)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def warmup(self, pool_size: int = 1, timeout: float = 2):
+        """
+        Open persistent connections to GROBID ahead of the first parse
+        
+        Args:
+            pool_size: Number of keep-alive connections to establish
+            timeout: Per-request timeout in seconds
+        """
+        pool_size = max(1, pool_size)
+        self._mount_adapter(pool_size)
+        
+        def _ping(_):
+            try:
+                self.session.head(f"{self.grobid_url}/api/isalive", timeout=timeout)
+            except requests.RequestException:
+                pass
+        
+        # Requests must overlap, otherwise they would all share one connection
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            list(executor.map(_ping, range(pool_size)))
+        
+    def validate_size(self, file_size: int) -> Tuple[bool, str, str]:
+        """
+        Check a file size against the configured limit
+        
+        Args:
+            file_size: Size of the file in bytes
+            
+        Returns:
+            Tuple of (is_valid, skip_reason, error_message)
+        """
+        if file_size > Config.MAX_FILE_SIZE_BYTES:
+            return False, "file_too_large", f"File size ({file_size / (1024*1024):.1f}MB) exceeds maximum allowed size ({Config.MAX_FILE_SIZE_MB}MB)"
+        return True, "", ""
+    
     def validate_file(self, filepath: str) -> Tuple[bool, str, str]:
         """
         Validate if the file can be processed
@@ -35,32 +268,35 @@ class DocumentParser:
             Tuple of (is_valid, skip_reason, error_message)
         """
         try:
-            # Check if file exists
-            if not os.path.exists(filepath):
+            # Check if file exists (one stat serves the existence, size and MIME checks)
+            try:
+                st = os.stat(filepath)
+            except FileNotFoundError:
                 return False, "file_not_found", "File does not exist"
             
             # Check file size
-            file_size = os.path.getsize(filepath)
-            max_size = Config.get_max_file_size_bytes()
-            if file_size > max_size:
-                return False, "file_too_large", f"File size ({file_size / (1024*1024):.1f}MB) exceeds maximum allowed size ({Config.get_max_file_size_mb()}MB)"
+            is_valid, skip_reason, error_msg = self.validate_size(st.st_size)
+            if not is_valid:
+                return is_valid, skip_reason, error_msg
             
             # Check file type
-            mime_type = magic.from_file(filepath, mime=True)
-            if mime_type not in self.supported_types:
+            mime_type = detect_mime_type(filepath, st)
+            if mime_type not in Config.SUPPORTED_MIME_SET:
                 return False, "unsupported_type", f"Unsupported file type: {mime_type}"
             
             # Additional PDF-specific validation
             if mime_type == 'application/pdf':
                 # Check if PDF is corrupted or encrypted
                 try:
-                    import PyPDF2
-                    with open(filepath, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        if len(pdf_reader.pages) == 0:
-                            return False, "empty_pdf", "PDF file is empty"
-                        if len(pdf_reader.pages) > Config.get_max_pages():
-                            return False, "too_many_pages", f"PDF has {len(pdf_reader.pages)} pages, maximum allowed is {Config.get_max_pages()}"
+                    page_count = _scan_pdf_page_count(filepath)
+                    if page_count is None:
+                        import PyPDF2
+                        with open(filepath, 'rb') as file:
+                            page_count = len(PyPDF2.PdfReader(file).pages)
+                    if page_count == 0:
+                        return False, "empty_pdf", "PDF file is empty"
+                    if page_count > Config.MAX_PAGES_PER_DOCUMENT:
+                        return False, "too_many_pages", f"PDF has {page_count} pages, maximum allowed is {Config.MAX_PAGES_PER_DOCUMENT}"
                 except Exception as e:
                     return False, "corrupt_pdf", f"PDF file appears to be corrupted: {str(e)}"
             
@@ -82,23 +318,21 @@ class DocumentParser:
             Dictionary containing parsed document data
         """
         if metadata_options is None:
-            metadata_options = ['title', 'author', 'topic']
+            metadata_options = list(Config.DEFAULT_METADATA_OPTIONS)
         
-        # Get file type
-        mime_type = magic.from_file(filepath, mime=True)
+        # Get file type; this stat also supplies file_size
+        st = os.stat(filepath)
+        mime_type = detect_mime_type(filepath, st)
         file_type = self.supported_types.get(mime_type, 'Unknown')
         
         # Parse based on file type
-        if file_type == 'PDF':
-            return self._parse_pdf_with_grobid(filepath, metadata_options, job_id)
-        elif file_type == 'DOCX':
-            return self._parse_docx(filepath, metadata_options, job_id)
-        elif file_type == 'TXT':
-            return self._parse_txt(filepath, metadata_options, job_id)
-        elif file_type == 'HTML':
-            return self._parse_html(filepath, metadata_options, job_id)
-        else:
+        parse = self._parsers.get(file_type)
+        if parse is None:
             raise ValueError(f"Unsupported file type: {file_type}")
+        
+        result = parse(filepath, metadata_options, job_id)
+        result['file_size'] = st.st_size
+        return result
     
     def _parse_pdf_with_grobid(self, filepath: str, metadata_options: List[str], job_id: str = None) -> Dict[str, Any]:
         """
@@ -117,35 +351,34 @@ class DocumentParser:
             with open(filepath, 'rb') as pdf_file:
                 files = {'input': pdf_file}
                 data = {
-                    'generateIDs': '1',
-                    'consolidateCitations': '0',  # Disable citation processing for speed
-                    'includeRawCitations': '0',   # Disable raw citations for speed
-                    'includeRawAffiliations': '0', # Disable affiliations for speed
-                    'teiCoordinates': '0'         # Disable coordinates for speed
+                    'consolidateHeader': '0',      # No external metadata lookups
+                    'includeRawAffiliations': '0'  # Disable affiliations for speed
                 }
                 
-                # Use full text endpoint but with optimized settings for faster processing
-                response = requests.post(
-                    f"{self.grobid_url}/api/processFulltextDocument",
-                    files=files,
-                    data=data,
-                    timeout=30  # Reduced timeout
-                )
+                # Every extracted field (title, authors, abstract, date, keywords) is in the TEI header,
+                # so the header model is enough; fulltext would also segment the body and citations.
+                # 503 is GROBID's backpressure signal (all its workers busy), so retry with backoff.
+                for attempt in range(Config.GROBID_BUSY_RETRIES + 1):
+                    if attempt:
+                        time.sleep(Config.GROBID_RETRY_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+                        pdf_file.seek(0)
+                    response = self._post_to_grobid('processHeaderDocument', files, data, timeout=30)
+                    if response.status_code != 503:
+                        break
                 
                 if response.status_code != 200:
                     print(f"GROBID API error: {response.status_code}")
-                    return self._parse_pdf_fallback(filepath, metadata_options, job_id)
+                    return self._parse_pdf_fallback(filepath, metadata_options, job_id, pdf_file)
                 
                 # Extract only requested metadata from GROBID result
-                parsed_data = self._extract_grobid_metadata_only(response.text, metadata_options)
+                parsed_data = self._extract_grobid_metadata_only(response.content, metadata_options)
                 
                 # Add common fields
                 parsed_data.update({
                     'file_type': 'PDF',
-                    'upload_date': datetime.now().isoformat(),
+                    'upload_date': _now_iso(),
                     'job_id': job_id,
-                    'parser': 'GROBID',
-                    'file_size': os.path.getsize(filepath)
+                    'parser': 'GROBID'
                 })
                 
                 return parsed_data
@@ -154,12 +387,28 @@ class DocumentParser:
             print(f"GROBID parsing failed, falling back to PyPDF2: {str(e)}")
             return self._parse_pdf_fallback(filepath, metadata_options, job_id)
     
-    def _extract_grobid_metadata_only(self, grobid_result: str, metadata_options: List[str]) -> Dict[str, Any]:
+    def _post_to_grobid(self, endpoint: str, files: Dict[str, Any], data: Dict[str, str], timeout: float):
+        """
+        POST a multipart form to a GROBID API endpoint
+        
+        With requests-toolbelt installed the form is streamed from the open file handles
+        in small chunks; otherwise requests builds the whole body in memory first.
+        """
+        url = f"{self.grobid_url}/api/{endpoint}"
+        if MultipartEncoder is None:
+            return self.session.post(url, files=files, data=data, timeout=timeout)
+        fields = dict(data)
+        for name, file in files.items():
+            fields[name] = (os.path.basename(file.name), file, 'application/pdf')
+        body = MultipartEncoder(fields=fields)
+        return self.session.post(url, data=body, headers={'Content-Type': body.content_type}, timeout=timeout)
+    
+    def _extract_grobid_metadata_only(self, grobid_result: bytes, metadata_options: List[str]) -> Dict[str, Any]:
         """
         Extract only requested metadata from GROBID result (XML or BibTeX) for faster processing
         
         Args:
-            grobid_result: XML or BibTeX result from GROBID
+            grobid_result: XML or BibTeX result from GROBID, as raw response bytes or text
             metadata_options: List of metadata fields to extract
             
         Returns:
@@ -169,26 +418,31 @@ class DocumentParser:
             # Initialize result dictionary with only requested fields
             result = {}
             
+            if isinstance(grobid_result, str):
+                grobid_result = grobid_result.encode('utf-8')
+            
             # Check if result is BibTeX format (starts with @)
-            if grobid_result.strip().startswith('@'):
-                return self._extract_bibtex_metadata(grobid_result, metadata_options)
+            if grobid_result.lstrip().startswith(b'@'):
+                return self._extract_bibtex_metadata(grobid_result.decode('utf-8'), metadata_options)
             
-            # Otherwise, try XML parsing
-            from xml.etree import ElementTree as ET
+            # Otherwise, parse the TEI header; every requested field lives there
+            header = _read_tei_header(grobid_result)
             
-            root = ET.fromstring(grobid_result)
+            # Resolve the two branches the fields hang off once, then walk down from them
+            bibl = header.find(HEADER_BIBL)
+            profile = header.find(HEADER_PROFILE)
             
             # Extract title if requested
             if 'title' in metadata_options:
-                title_elem = root.find('.//{http://www.tei-c.org/ns/1.0}titleStmt/{http://www.tei-c.org/ns/1.0}title')
+                title_elem = header.find(HEADER_TITLE)
                 result['title'] = title_elem.text.strip() if title_elem is not None and title_elem.text else ''
             
             # Extract author if requested
             if 'author' in metadata_options:
                 authors = []
-                for author in root.findall('.//{http://www.tei-c.org/ns/1.0}sourceDesc/{http://www.tei-c.org/ns/1.0}biblStruct/{http://www.tei-c.org/ns/1.0}analytic/{http://www.tei-c.org/ns/1.0}author'):
-                    forename = author.find('.//{http://www.tei-c.org/ns/1.0}forename')
-                    surname = author.find('.//{http://www.tei-c.org/ns/1.0}surname')
+                for author in (bibl.findall(BIBL_AUTHORS) if bibl is not None else ()):
+                    forename = author.find(TEI_FORENAME)
+                    surname = author.find(TEI_SURNAME)
                     if forename is not None and surname is not None:
                         authors.append({
                             'first_name': forename.text.strip() if forename.text else '',
@@ -211,18 +465,18 @@ class DocumentParser:
             
             # Extract abstract if requested
             if 'abstract' in metadata_options:
-                abstract_elem = root.find('.//{http://www.tei-c.org/ns/1.0}profileDesc/{http://www.tei-c.org/ns/1.0}abstract')
+                abstract_elem = profile.find(PROFILE_ABSTRACT) if profile is not None else None
                 result['abstract'] = ''.join(abstract_elem.itertext()).strip() if abstract_elem is not None else ''
             
             # Extract published date if requested
             if 'published_date' in metadata_options:
-                date_elem = root.find('.//{http://www.tei-c.org/ns/1.0}sourceDesc/{http://www.tei-c.org/ns/1.0}biblStruct/{http://www.tei-c.org/ns/1.0}monogr/{http://www.tei-c.org/ns/1.0}imprint/{http://www.tei-c.org/ns/1.0}date')
+                date_elem = bibl.find(BIBL_DATE) if bibl is not None else None
                 result['published_date'] = date_elem.text.strip() if date_elem is not None and date_elem.text else ''
             
             # Extract topic/keywords if requested
             if 'topic' in metadata_options:
                 keywords = []
-                for keyword in root.findall('.//{http://www.tei-c.org/ns/1.0}profileDesc/{http://www.tei-c.org/ns/1.0}textClass/{http://www.tei-c.org/ns/1.0}keywords/{http://www.tei-c.org/ns/1.0}term'):
+                for keyword in (profile.findall(PROFILE_KEYWORDS) if profile is not None else ()):
                     if keyword.text:
                         keywords.append(keyword.text.strip())
                 result['topic'] = ', '.join(keywords[:5]) if keywords else ''  # First 5 keywords as topic
@@ -248,20 +502,16 @@ class DocumentParser:
         """
         result = {}
         
-        # Simple BibTeX parsing
-        lines = bibtex_result.strip().split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('title = {'):
+        # One pass picks out the fields; values may span lines and contain nested braces
+        for key, value in _bibtex_fields(bibtex_result):
+            if key == 'title':
                 if 'title' in metadata_options:
-                    result['title'] = line.split('{', 1)[1].rsplit('}', 1)[0]
-            elif line.startswith('author = {'):
+                    result['title'] = value
+            elif key == 'author':
                 if 'author' in metadata_options:
-                    author_text = line.split('{', 1)[1].rsplit('}', 1)[0]
                     # Parse multiple authors separated by 'and'
                     authors = []
-                    for author_part in author_text.split(' and '):
+                    for author_part in value.split(' and '):
                         author_part = author_part.strip()
                         if author_part:
                             # Try to split into first and last name
@@ -275,35 +525,17 @@ class DocumentParser:
                                 })
                             else:
                                 # First Last format or single name
-                                name_parts = author_part.split(' ')
-                                if len(name_parts) >= 2:
-                                    authors.append({
-                                        'first_name': ' '.join(name_parts[:-1]).strip(),
-                                        'last_name': name_parts[-1].strip(),
-                                        'full_name': author_part
-                                    })
-                                else:
-                                    authors.append({
-                                        'first_name': '',
-                                        'last_name': author_part,
-                                        'full_name': author_part
-                                    })
+                                authors.append(_author_from_name(author_part))
                     result['author'] = authors
-            elif line.startswith('year = {'):
+            elif key == 'year':
                 if 'published_date' in metadata_options:
-                    result['published_date'] = line.split('{', 1)[1].rsplit('}', 1)[0]
-            elif line.startswith('doi = {'):
+                    result['published_date'] = value
+            elif key == 'doi':
                 if 'topic' in metadata_options:
-                    doi = line.split('{', 1)[1].rsplit('}', 1)[0]
-                    result['topic'] = f"DOI: {doi}"
+                    result['topic'] = f"DOI: {value}"
         
         # Set empty values for other requested fields
-        for field in metadata_options:
-            if field not in result:
-                if field == 'author':
-                    result[field] = []
-                else:
-                    result[field] = ''
+        _fill_missing_fields(result, metadata_options)
         
         # Text field removed for faster parsing
         
@@ -321,9 +553,7 @@ class DocumentParser:
             Dictionary containing extracted data
         """
         try:
-            from xml.etree import ElementTree as ET
-            
-            root = ET.fromstring(grobid_result)
+            root = ET.fromstring(grobid_result.encode('utf-8'))
             
             # Initialize result dictionary
             result = {
@@ -340,31 +570,31 @@ class DocumentParser:
             }
             
             # Extract title
-            title_elem = root.find('.//{http://www.tei-c.org/ns/1.0}titleStmt/{http://www.tei-c.org/ns/1.0}title')
+            title_elem = root.find(TEI_TITLE)
             if title_elem is not None:
                 result['title'] = title_elem.text.strip() if title_elem.text else ''
             
             # Extract authors
             authors = []
-            for author in root.findall('.//{http://www.tei-c.org/ns/1.0}sourceDesc/{http://www.tei-c.org/ns/1.0}biblStruct/{http://www.tei-c.org/ns/1.0}analytic/{http://www.tei-c.org/ns/1.0}author'):
-                forename = author.find('.//{http://www.tei-c.org/ns/1.0}forename')
-                surname = author.find('.//{http://www.tei-c.org/ns/1.0}surname')
+            for author in root.findall(TEI_AUTHORS):
+                forename = author.find(TEI_FORENAME)
+                surname = author.find(TEI_SURNAME)
                 if forename is not None and surname is not None:
                     authors.append(f"{forename.text} {surname.text}")
             result['author'] = '; '.join(authors)
             
             # Extract abstract
-            abstract_elem = root.find('.//{http://www.tei-c.org/ns/1.0}profileDesc/{http://www.tei-c.org/ns/1.0}abstract')
+            abstract_elem = root.find(TEI_ABSTRACT)
             if abstract_elem is not None:
                 result['abstract'] = ''.join(abstract_elem.itertext()).strip()
             
             # Extract publication date
-            date_elem = root.find('.//{http://www.tei-c.org/ns/1.0}sourceDesc/{http://www.tei-c.org/ns/1.0}biblStruct/{http://www.tei-c.org/ns/1.0}monogr/{http://www.tei-c.org/ns/1.0}imprint/{http://www.tei-c.org/ns/1.0}date')
+            date_elem = root.find(TEI_DATE)
             if date_elem is not None:
                 result['published_date'] = date_elem.text.strip() if date_elem.text else ''
             
             # Extract full text
-            body_elem = root.find('.//{http://www.tei-c.org/ns/1.0}text/{http://www.tei-c.org/ns/1.0}body')
+            body_elem = root.find(TEI_BODY)
             if body_elem is not None:
                 full_text = ''.join(body_elem.itertext()).strip()
                 result['full_text'] = full_text
@@ -372,8 +602,8 @@ class DocumentParser:
                 
                 # Extract sections
                 sections = []
-                for div in body_elem.findall('.//{http://www.tei-c.org/ns/1.0}div'):
-                    head = div.find('.//{http://www.tei-c.org/ns/1.0}head')
+                for div in body_elem.findall(TEI_DIV):
+                    head = div.find(TEI_HEAD)
                     if head is not None:
                         section_title = head.text.strip() if head.text else ''
                         section_text = ''.join(div.itertext()).strip()
@@ -385,7 +615,7 @@ class DocumentParser:
             
             # Extract references
             references = []
-            for ref in root.findall('.//{http://www.tei-c.org/ns/1.0}listBibl/{http://www.tei-c.org/ns/1.0}biblStruct'):
+            for ref in root.findall(TEI_REFERENCES):
                 ref_text = ''.join(ref.itertext()).strip()
                 if ref_text:
                     references.append(ref_text)
@@ -393,7 +623,7 @@ class DocumentParser:
             
             # Extract keywords
             keywords = []
-            for keyword in root.findall('.//{http://www.tei-c.org/ns/1.0}profileDesc/{http://www.tei-c.org/ns/1.0}textClass/{http://www.tei-c.org/ns/1.0}keywords/{http://www.tei-c.org/ns/1.0}term'):
+            for keyword in root.findall(TEI_KEYWORDS):
                 if keyword.text:
                     keywords.append(keyword.text.strip())
             result['keywords'] = keywords
@@ -419,7 +649,8 @@ class DocumentParser:
                 'full_text': ''
             }
     
-    def _parse_pdf_fallback(self, filepath: str, metadata_options: List[str], job_id: str = None) -> Dict[str, Any]:
+    def _parse_pdf_fallback(self, filepath: str, metadata_options: List[str], job_id: str = None,
+                            fileobj=None) -> Dict[str, Any]:
         """
         Fallback PDF parsing using PyPDF2 - only extract requested metadata
         
@@ -427,71 +658,48 @@ class DocumentParser:
             filepath: Path to the PDF file
             metadata_options: List of metadata fields to extract
             job_id: Optional job ID for tracking
+            fileobj: Binary handle already open on the PDF; it is rewound and left open
             
         Returns:
             Dictionary containing parsed PDF data
         """
         import PyPDF2
         
-        with open(filepath, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            # Initialize result with only requested fields
-            result = {
-                'file_type': 'PDF',
-                'upload_date': datetime.now().isoformat(),
-                'job_id': job_id,
-                'parser': 'PyPDF2',
-                'file_size': os.path.getsize(filepath),
-                'page_count': len(pdf_reader.pages)
-            }
-            
-            # Extract metadata only if requested
-            metadata = pdf_reader.metadata or {}
-            
-            if 'title' in metadata_options:
-                result['title'] = metadata.get('/Title', '')
-            
-            if 'author' in metadata_options:
-                author_text = metadata.get('/Author', '')
-                if author_text:
-                    # Parse multiple authors separated by ';' or ','
-                    authors = []
-                    for author_part in author_text.replace(';', ',').split(','):
-                        author_part = author_part.strip()
-                        if author_part:
-                            # Try to split into first and last name
-                            name_parts = author_part.split(' ')
-                            if len(name_parts) >= 2:
-                                authors.append({
-                                    'first_name': ' '.join(name_parts[:-1]).strip(),
-                                    'last_name': name_parts[-1].strip(),
-                                    'full_name': author_part
-                                })
-                            else:
-                                authors.append({
-                                    'first_name': '',
-                                    'last_name': author_part,
-                                    'full_name': author_part
-                                })
-                    result['author'] = authors
-                else:
-                    result['author'] = []
-            
-            if 'published_date' in metadata_options:
-                result['published_date'] = metadata.get('/CreationDate', '')
-            
-            # Set empty values for other requested fields
-            for field in metadata_options:
-                if field not in result:
-                    if field == 'author':
-                        result[field] = []
-                    else:
-                        result[field] = ''
-            
-            # Text field removed for faster parsing
-            
-            return result
+        if fileobj is None:
+            with open(filepath, 'rb') as file:
+                return self._parse_pdf_fallback(filepath, metadata_options, job_id, file)
+        
+        fileobj.seek(0)
+        pdf_reader = PyPDF2.PdfReader(fileobj)
+        
+        # Initialize result with only requested fields
+        result = {
+            'file_type': 'PDF',
+            'upload_date': _now_iso(),
+            'job_id': job_id,
+            'parser': 'PyPDF2',
+            'page_count': len(pdf_reader.pages)
+        }
+        
+        # Extract metadata only if requested
+        metadata = pdf_reader.metadata or {}
+        
+        if 'title' in metadata_options:
+            result['title'] = metadata.get('/Title', '')
+        
+        if 'author' in metadata_options:
+            # Multiple authors are separated by ';' or ','
+            result['author'] = _parse_author_string(metadata.get('/Author', ''))
+        
+        if 'published_date' in metadata_options:
+            result['published_date'] = metadata.get('/CreationDate', '')
+        
+        # Set empty values for other requested fields
+        _fill_missing_fields(result, metadata_options)
+        
+        # Text field removed for faster parsing
+        
+        return result
     
     def _parse_docx(self, filepath: str, metadata_options: List[str], job_id: str = None) -> Dict[str, Any]:
         """
@@ -512,10 +720,9 @@ class DocumentParser:
         # Initialize result with only requested fields
         result = {
             'file_type': 'DOCX',
-            'upload_date': datetime.now().isoformat(),
+            'upload_date': _now_iso(),
             'job_id': job_id,
-            'parser': 'python-docx',
-            'file_size': os.path.getsize(filepath)
+            'parser': 'python-docx'
         }
         
         # Extract metadata only if requested
@@ -525,41 +732,14 @@ class DocumentParser:
             result['title'] = core_props.title or ''
         
         if 'author' in metadata_options:
-            author_text = core_props.author or ''
-            if author_text:
-                # Parse multiple authors separated by ';' or ','
-                authors = []
-                for author_part in author_text.replace(';', ',').split(','):
-                    author_part = author_part.strip()
-                    if author_part:
-                        # Try to split into first and last name
-                        name_parts = author_part.split(' ')
-                        if len(name_parts) >= 2:
-                            authors.append({
-                                'first_name': ' '.join(name_parts[:-1]).strip(),
-                                'last_name': name_parts[-1].strip(),
-                                'full_name': author_part
-                            })
-                        else:
-                            authors.append({
-                                'first_name': '',
-                                'last_name': author_part,
-                                'full_name': author_part
-                            })
-                result['author'] = authors
-            else:
-                result['author'] = []
+            # Multiple authors are separated by ';' or ','
+            result['author'] = _parse_author_string(core_props.author)
         
         if 'published_date' in metadata_options:
             result['published_date'] = str(core_props.created) if core_props.created else ''
         
         # Set empty values for other requested fields
-        for field in metadata_options:
-            if field not in result:
-                if field == 'author':
-                    result[field] = []
-                else:
-                    result[field] = ''
+        _fill_missing_fields(result, metadata_options)
         
         # Text field removed for faster parsing
         
@@ -577,16 +757,12 @@ class DocumentParser:
         Returns:
             Dictionary containing parsed TXT data
         """
-        with open(filepath, 'r', encoding='utf-8') as file:
-            text = file.read()
-        
-        # Initialize result with only requested fields
+        # Only the filename and size are used, so the file itself is never opened
         result = {
             'file_type': 'TXT',
-            'upload_date': datetime.now().isoformat(),
+            'upload_date': _now_iso(),
             'job_id': job_id,
-            'parser': 'built-in',
-            'file_size': os.path.getsize(filepath)
+            'parser': 'built-in'
         }
         
         # Extract title if requested (use filename)
@@ -594,12 +770,7 @@ class DocumentParser:
             result['title'] = os.path.basename(filepath)
         
         # Set empty values for other requested fields
-        for field in metadata_options:
-            if field not in result:
-                if field == 'author':
-                    result[field] = []
-                else:
-                    result[field] = ''
+        _fill_missing_fields(result, metadata_options)
         
         # Text field removed for faster parsing
         
@@ -617,34 +788,26 @@ class DocumentParser:
         Returns:
             Dictionary containing parsed HTML data
         """
-        from bs4 import BeautifulSoup
-        
-        with open(filepath, 'r', encoding='utf-8') as file:
-            html_content = file.read()
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
         # Initialize result with only requested fields
         result = {
             'file_type': 'HTML',
-            'upload_date': datetime.now().isoformat(),
+            'upload_date': _now_iso(),
             'job_id': job_id,
-            'parser': 'BeautifulSoup',
-            'file_size': os.path.getsize(filepath)
+            'parser': 'html.parser'
         }
         
-        # Extract title if requested
+        # Extract title if requested; the file is only read up to the closing </title>
         if 'title' in metadata_options:
-            title = soup.find('title')
-            result['title'] = title.text.strip() if title else ''
+            extractor = _HTMLTitleExtractor()
+            with open(filepath, 'r', encoding='utf-8') as file:
+                for chunk in iter(lambda: file.read(64 * 1024), ''):
+                    extractor.feed(chunk)
+                    if extractor.done:
+                        break
+            result['title'] = ''.join(extractor.parts).strip()
         
         # Set empty values for other requested fields
-        for field in metadata_options:
-            if field not in result:
-                if field == 'author':
-                    result[field] = []
-                else:
-                    result[field] = ''
+        _fill_missing_fields(result, metadata_options)
         
         # Text field removed for faster parsing
         
@@ -658,7 +821,24 @@ class DocumentParser:
             True if GROBID is available, False otherwise
         """
         try:
-            response = requests.get(f"{self.grobid_url}/api/isalive", timeout=5)
+            response = self.session.get(f"{self.grobid_url}/api/isalive", timeout=5)
             return response.status_code == 200
         except:
             return False
+
+
+# Parser owned by a worker process, created on first use
+_worker_parser = None
+
+
+def parse_in_worker(filepath: str, metadata_options: List[str] = None, job_id: str = None) -> Dict[str, Any]:
+    """
+    Parse a document inside a process-pool worker
+    
+    Module-level so it can be pickled by ProcessPoolExecutor; each worker
+    process builds its own DocumentParser on first use.
+    """
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = DocumentParser()
+    return _worker_parser.parse_document(filepath, metadata_options, job_id)
@@ -1,10 +1,61 @@
+import atexit
 import uuid
 import json
 import os
+import re
+import shutil
 import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from typing import Dict, List, Optional
+from config import Config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Buffer for job results files, which can run to several MB (open()'s default is 8 KiB)
+_FILE_BUFFER_SIZE = 1 << 18
+
+
+def _dumps_line(obj) -> bytes:
+    """Serialize to one UTF-8 JSON line, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, default=str) + '\n').encode('utf-8')
+
+
+def _dumps_indented(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _loads(data):
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _fsync_directory(path: str):
+    """Make a rename into a directory durable (a no-op where directories can't be opened)"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class JobStatus(Enum):
     PROCESSING = "Processing"
@@ -12,19 +63,55 @@ class JobStatus(Enum):
     FAILED = "Failed"
 
 class JobManager:
+    # Seconds between writes of a running job's metadata file
+    METADATA_FLUSH_INTERVAL = 0.5
+    # Finished jobs whose file results are kept in memory; older ones are re-read from disk on demand
+    RESULTS_CACHE_SIZE = 100
+    # Latest file results a running job keeps in memory for live display; the full list is in its results file
+    LIVE_RESULTS_SIZE = 500
+    # Failure messages counted as corrupt files
+    _CORRUPT_RE = re.compile(r'corrupt|not readable|not parsable', re.IGNORECASE)
+    # Threads reading job files in parallel when loading jobs from disk
+    LOAD_WORKERS = 32
+    # Seconds list_jobs may go without rescanning the job directories while their mtimes are unchanged
+    DISK_SYNC_INTERVAL = 2.0
+    
     def __init__(self):
         self.jobs = {}  # job_id -> job_info
-        self.job_results_dir = "job_results"
-        self.jobs_metadata_dir = "job_metadata"
+        self.lock = threading.RLock()
+        # Jobs created by this process; anything else may be owned by another worker
+        self._owned = set()
+        # Jobs whose metadata changed since it was last written; the flusher thread saves them
+        self._dirty = set()
+        # job_id -> append handle on the partial results file of a running job
+        self._result_files = {}
+        # Running jobs whose live results buffer has dropped older results
+        self._truncated = set()
+        # Finished jobs holding their results in memory, least recently used first
+        self._loaded_results = OrderedDict()
+        # job_id -> summary built by get_job_summary, dropped whenever the job changes
+        self._summaries = {}
+        # (directory mtimes, monotonic time) of the last scan for other workers' jobs
+        self._disk_sync = None
+        # Metadata files are written here so worker threads don't wait on the disk; a single
+        # writer keeps each job's writes in order
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='docusearch-job-io')
+        self.job_results_dir = Config.JOB_RESULTS_FOLDER
+        self.jobs_metadata_dir = Config.JOB_METADATA_FOLDER
         os.makedirs(self.job_results_dir, exist_ok=True)
         os.makedirs(self.jobs_metadata_dir, exist_ok=True)
         
         # Load existing jobs from metadata files
         self._load_existing_jobs()
+        
+        # Progress updates are coalesced and written at most every METADATA_FLUSH_INTERVAL seconds
+        threading.Thread(target=self._flush_loop, name='docusearch-job-flush', daemon=True).start()
+        atexit.register(self.flush)
     
     def create_job(self, total_files: int, metadata_options: List[str], data_source: str = 'Local') -> str:
         """Create a new job and return job ID"""
         job_id = str(uuid.uuid4())[:8]  # Short job ID
+        now = time.time()
         
         job_info = {
             'job_id': job_id,
@@ -40,41 +127,45 @@ class JobManager:
                 'page_limit': 0
             },
             'corrupt_files': 0,
-            'start_time': datetime.now().isoformat(),
+            'start_time': datetime.fromtimestamp(now).isoformat(),
             'end_time': None,
+            # Epoch seconds, so processing time is a subtraction rather than two ISO parses
+            'start_epoch': now,
+            'end_epoch': None,
             'current_file': None,
             'progress_percentage': 0,
             'metadata_options': metadata_options,
             'data_source': data_source,
-            'results': []
+            'results': deque(maxlen=self.LIVE_RESULTS_SIZE)
         }
         
-        self.jobs[job_id] = job_info
-        self._save_job_metadata(job_id)
+        with self.lock:
+            self.jobs[job_id] = job_info
+            self._owned.add(job_id)
+            # File results are appended here as they arrive instead of being rewritten with the metadata
+            self._result_files[job_id] = open(self._partial_results_path(job_id), 'ab', buffering=_FILE_BUFFER_SIZE)
+            self._save_job_metadata(job_id)
         return job_id
     
     def update_job_progress(self, job_id: str, current_file: str, processed: int, successful: int, failed: int):
         """Update job progress"""
-        if job_id not in self.jobs:
-            return
-        
-        job = self.jobs[job_id]
-        job['processed_files'] = processed
-        job['successful_files'] = successful
-        job['failed_files'] = failed
-        job['current_file'] = current_file
-        job['progress_percentage'] = int((processed / job['total_files']) * 100) if job['total_files'] > 0 else 0
-        
-        # Save updated job metadata
-        self._save_job_metadata(job_id)
+        with self.lock:
+            if job_id not in self.jobs:
+                return
+            
+            job = self.jobs[job_id]
+            job['processed_files'] = processed
+            job['successful_files'] = successful
+            job['failed_files'] = failed
+            job['current_file'] = current_file
+            job['progress_percentage'] = int((processed / job['total_files']) * 100) if job['total_files'] > 0 else 0
+            
+            # Saved by the flusher thread
+            self._dirty.add(job_id)
+            self._summaries.pop(job_id, None)
     
     def add_file_result(self, job_id: str, filename: str, success: bool, metadata: Dict = None, error: str = None, skip_reason: str = None):
         """Add a file processing result to the job"""
-        if job_id not in self.jobs:
-            return
-        
-        job = self.jobs[job_id]
-        
         result = {
             'filename': filename,
             'success': success,
@@ -84,92 +175,345 @@ class JobManager:
             'skip_reason': skip_reason
         }
         
-        job['results'].append(result)
-        
-        if success:
-            job['successful_files'] += 1
-        elif skip_reason:
-            job['skipped_files'] += 1
-            if skip_reason in job['skipped_reasons']:
-                job['skipped_reasons'][skip_reason] += 1
-        else:
-            job['failed_files'] += 1
-            if error and ('corrupt' in error.lower() or 'not readable' in error.lower() or 'not parsable' in error.lower()):
-                job['corrupt_files'] += 1
-        
-        # Save updated job metadata
-        self._save_job_metadata(job_id)
+        with self.lock:
+            if job_id not in self.jobs:
+                return
+            
+            job = self.jobs[job_id]
+            live_results = job['results']
+            if len(live_results) == live_results.maxlen:
+                self._truncated.add(job_id)
+            live_results.append(result)
+            result_file = self._result_files.get(job_id)
+            if result_file is not None:
+                result_file.write(_dumps_line(result))
+            
+            if success:
+                job['successful_files'] += 1
+            elif skip_reason:
+                job['skipped_files'] += 1
+                if skip_reason in job['skipped_reasons']:
+                    job['skipped_reasons'][skip_reason] += 1
+            else:
+                job['failed_files'] += 1
+                if error and self._CORRUPT_RE.search(error):
+                    job['corrupt_files'] += 1
+            
+            # Saved by the flusher thread
+            self._dirty.add(job_id)
+            self._summaries.pop(job_id, None)
     
     def complete_job(self, job_id: str, success: bool = True):
         """Mark job as completed or failed"""
-        if job_id not in self.jobs:
-            return
+        with self.lock:
+            if job_id not in self.jobs:
+                return
+            
+            job = self.jobs[job_id]
+            status = JobStatus.COMPLETED.value if success else JobStatus.FAILED.value
+            now = time.time()
+            job['end_time'] = datetime.fromtimestamp(now).isoformat()
+            job['end_epoch'] = now
+            job['progress_percentage'] = 100
+            self._summaries.pop(job_id, None)
+            
+            # Closed here, so the partial file holds every result before it is copied
+            result_file = self._result_files.pop(job_id, None)
+            if result_file is not None:
+                result_file.close()
+            summary = self._results_summary(job, status)
+            live_results = list(job.get('results', ()))
+        
+        # Save job results to JSONL file. The copy and fsyncs run without the lock so other
+        # jobs aren't held up; the status only changes once the file is in place, so a job
+        # reported Completed can always be downloaded.
+        self._save_job_results(job_id, summary, live_results)
         
-        job = self.jobs[job_id]
-        job['status'] = JobStatus.COMPLETED.value if success else JobStatus.FAILED.value
-        job['end_time'] = datetime.now().isoformat()
-        job['progress_percentage'] = 100
+        with self.lock:
+            if self.jobs.get(job_id) is not job:
+                return
+            job['status'] = status
+            self._summaries.pop(job_id, None)
+            
+            # Save final job metadata now rather than on the next flush, synced to disk
+            # since it won't be rewritten
+            self._dirty.discard(job_id)
+            self._save_job_metadata(job_id, durable=True)
+            
+            # The live results are only the latest few; get_job_results reads the full list from disk
+            job.pop('results', None)
+            self._truncated.discard(job_id)
+    
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Get a job by ID
         
-        # Save job results to JSONL file
-        self._save_job_results(job_id)
+        Jobs created by another worker process are read from their metadata file,
+        and re-read while they are still processing so their progress stays current.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and (job_id in self._owned or job.get('status') != JobStatus.PROCESSING.value):
+                return job
         
-        # Save final job metadata
-        self._save_job_metadata(job_id)
+        loaded = self._read_job_from_disk(job_id)
+        if loaded is None:
+            return job
+        with self.lock:
+            if job_id in self._owned:
+                return self.jobs[job_id]
+            self.jobs[job_id] = loaded
+            self._summaries.pop(job_id, None)
+        return loaded
+    
+    def delete_job(self, job_id: str) -> bool:
+        """Forget a job, returning whether it was known (files are removed by the caller)"""
+        with self.lock:
+            self._owned.discard(job_id)
+            self._dirty.discard(job_id)
+            self._discard_partial_results(job_id)
+            self._loaded_results.pop(job_id, None)
+            self._truncated.discard(job_id)
+            self._summaries.pop(job_id, None)
+            known = self.jobs.pop(job_id, None) is not None
+        # Let queued metadata writes finish so the caller can remove the job's files for good
+        self._wait_for_writes()
+        return known
+    
+    def clear_jobs(self) -> int:
+        """Forget all jobs, returning how many were known"""
+        with self.lock:
+            count = len(self.jobs)
+            self.jobs.clear()
+            self._owned.clear()
+            self._dirty.clear()
+            self._loaded_results.clear()
+            self._truncated.clear()
+            self._summaries.clear()
+            for job_id in list(self._result_files):
+                self._discard_partial_results(job_id)
+        self._wait_for_writes()
+        return count
+    
+    def flush(self):
+        """Write the metadata of every job changed since the last flush"""
+        with self.lock:
+            dirty, self._dirty = self._dirty, set()
+            for job_id in dirty:
+                # Push buffered results out too, so other workers reading the partial file keep up
+                result_file = self._result_files.get(job_id)
+                if result_file is not None:
+                    result_file.flush()
+                self._save_job_metadata(job_id)
+    
+    def _wait_for_writes(self):
+        """Block until every metadata write queued so far has finished"""
+        try:
+            self._io_executor.submit(lambda: None).result()
+        except RuntimeError:
+            # Executor already shut down at interpreter exit; writes are synchronous from then on
+            pass
+    
+    def _flush_loop(self):
+        """Flusher thread: periodically write coalesced job metadata updates"""
+        while True:
+            time.sleep(self.METADATA_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing job metadata: {str(e)}")
+    
+    def job_count(self) -> int:
+        """Number of jobs known to this worker"""
+        with self.lock:
+            return len(self.jobs)
     
     def get_job_status(self, job_id: str) -> Optional[Dict]:
-        """Get current job status"""
-        job = self.jobs.get(job_id)
-        if job:
-            # Add processing time to the response
-            job['processing_time'] = self._calculate_processing_time(job)
-        return job
+        """
+        Get current job status, including its file results
+        
+        A job running in this worker reports only its latest LIVE_RESULTS_SIZE results,
+        with results_truncated set once older ones have been dropped; the full list is
+        available from get_job_results.
+        """
+        job = self.get_job(job_id)
+        if not job:
+            return job
+        # Processing time goes on a copy; the shared job dict is only changed by its writers
+        with self.lock:
+            status = {**job, 'processing_time': self._calculate_processing_time(job)}
+            if isinstance(status.get('results'), deque):
+                status['results'] = list(status['results'])
+                status['results_truncated'] = job_id in self._truncated
+                return status
+        
+        # Finished jobs (and jobs running in other workers) load their results from disk,
+        # through the same cache get_job_results uses
+        full = self.get_job_results(job_id)
+        status['results'] = full.get('results', []) if full else []
+        status['results_truncated'] = False
+        return status
     
     def get_job_results(self, job_id: str) -> Optional[Dict]:
         """Get job results including individual file results"""
-        job = self.jobs.get(job_id)
+        job = self.get_job(job_id)
         if not job:
             return None
         
-        # Try to load results from JSONL file if not in memory
-        if not job.get('results') or len(job['results']) == 0:
-            self._load_job_results_from_file(job_id)
+        if job.get('status') == JobStatus.PROCESSING.value:
+            # A running job only keeps its latest results in memory; all of them are in its partial file
+            with self.lock:
+                result_file = self._result_files.get(job_id)
+                if result_file is not None:
+                    result_file.flush()
+            job = dict(job, results=self._read_partial_results(job_id))
+        elif not self._touch_loaded_results(job_id):
+            # Results are read from the JSONL file when first asked for, then kept (even when empty)
+            # until evicted; a finished job's results file isn't rewritten
+            job_data = self._read_job_results_file(job_id)
+            if job_data is not None:
+                self._load_job_results(job_id, job_data)
+                job = dict(job, **job_data)
+            else:
+                job = dict(job, results=[])
         
-        return job
+        # A copy, so evicting the results later doesn't touch a response being built
+        return dict(job)
     
-    def _save_job_results(self, job_id: str):
-        """Save job results to JSONL file"""
-        if job_id not in self.jobs:
-            return
-        
-        job = self.jobs[job_id]
+    def _touch_loaded_results(self, job_id: str) -> bool:
+        """Mark a finished job's results as recently used, returning whether they are in memory"""
+        with self.lock:
+            if job_id not in self._loaded_results or 'results' not in self.jobs.get(job_id, ()):
+                return False
+            self._loaded_results.move_to_end(job_id)
+            return True
+    
+    def _load_job_results(self, job_id: str, job_data: Dict):
+        """Keep results read from a job's JSONL file in memory, evicting the least recently used"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.get('status') == JobStatus.PROCESSING.value:
+                return
+            job.update(job_data)
+            self._summaries.pop(job_id, None)
+            self._track_loaded_results(job_id)
+    
+    def _track_loaded_results(self, job_id: str):
+        """Mark a finished job's in-memory results as most recently used (caller holds the lock)"""
+        self._loaded_results[job_id] = None
+        self._loaded_results.move_to_end(job_id)
+        while len(self._loaded_results) > self.RESULTS_CACHE_SIZE:
+            evicted, _ = self._loaded_results.popitem(last=False)
+            job = self.jobs.get(evicted)
+            if job is not None:
+                job.pop('results', None)
+    
+    def _partial_results_path(self, job_id: str) -> str:
+        """Path of the append-only results file written while a job runs"""
+        return os.path.join(self.job_results_dir, f"job_{job_id}_results.jsonl.part")
+    
+    def _read_partial_results(self, job_id: str) -> List[Dict]:
+        """Read the file results a running job has appended so far"""
+        try:
+            with open(self._partial_results_path(job_id), 'rb') as f:
+                # The last line may still be half-written by the owning worker
+                results = []
+                for line in f:
+                    if line.endswith(b'\n'):
+                        results.append(_loads(line))
+                return results
+        except (OSError, ValueError):
+            return []
+    
+    def _discard_partial_results(self, job_id: str):
+        """Close and remove a job's partial results file (caller holds the lock)"""
+        result_file = self._result_files.pop(job_id, None)
+        if result_file is not None:
+            result_file.close()
+        try:
+            os.remove(self._partial_results_path(job_id))
+        except FileNotFoundError:
+            pass
+    
+    def _results_summary(self, job: Dict, status: str) -> Dict:
+        """First line of a job's results file"""
+        return {
+            'job_id': job['job_id'],
+            'status': status,
+            'total_files': job['total_files'],
+            'successful_files': job['successful_files'],
+            'failed_files': job['failed_files'],
+            'skipped_files': job['skipped_files'],
+            'skipped_reasons': dict(job['skipped_reasons']),
+            'corrupt_files': job['corrupt_files'],
+            'start_time': job['start_time'],
+            'end_time': job['end_time'],
+            'start_epoch': job.get('start_epoch'),
+            'end_epoch': job.get('end_epoch'),
+            'processing_time_seconds': self._calculate_processing_time(job),
+            'metadata_options': job['metadata_options']
+        }
+    
+    def _save_job_results(self, job_id: str, summary: Dict, live_results: List[Dict]):
+        """Save job results to JSONL file (called without the lock)"""
         jsonl_filename = f"job_{job_id}_results.jsonl"
         jsonl_path = os.path.join(self.job_results_dir, jsonl_filename)
+        partial_path = self._partial_results_path(job_id)
+        has_partial = os.path.exists(partial_path)
         
-        with open(jsonl_path, 'w', encoding='utf-8') as f:
-            # Write job summary first
-            summary = {
-                'job_id': job['job_id'],
-                'status': job['status'],
-                'total_files': job['total_files'],
-                'successful_files': job['successful_files'],
-                'failed_files': job['failed_files'],
-                'skipped_files': job['skipped_files'],
-                'skipped_reasons': job['skipped_reasons'],
-                'corrupt_files': job['corrupt_files'],
-                'start_time': job['start_time'],
-                'end_time': job['end_time'],
-                'processing_time_seconds': self._calculate_processing_time(job),
-                'metadata_options': job['metadata_options']
-            }
-            f.write(json.dumps(summary, ensure_ascii=False) + '\n')
-            
-            # Write individual file results
-            for result in job['results']:
-                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+        # Written to a temporary name and renamed, so readers never see a half-written file
+        tmp_path = f"{jsonl_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb', buffering=_FILE_BUFFER_SIZE) as f:
+                # Write job summary first
+                f.write(_dumps_line(summary))
+                
+                # Copy the results appended while the job ran; jobs without a partial file
+                # (created before results were appended) are written from memory
+                if has_partial:
+                    with open(partial_path, 'rb', buffering=0) as partial:
+                        shutil.copyfileobj(partial, f, _FILE_BUFFER_SIZE)
+                else:
+                    for result in live_results:
+                        f.write(_dumps_line(result))
+                
+                # Written once per job, so it is worth syncing before the rename
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, jsonl_path)
+        except OSError:
+            # The partial file disappears when the job is deleted mid-write; that isn't an error
+            with self.lock:
+                deleted = job_id not in self.jobs
+            if not deleted:
+                raise
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        _fsync_directory(self.job_results_dir)
+        if has_partial:
+            try:
+                os.remove(partial_path)
+            except FileNotFoundError:
+                pass
+        
+        # A job deleted while its file was being written mustn't be brought back by it
+        with self.lock:
+            deleted = job_id not in self.jobs
+        if deleted:
+            try:
+                os.remove(jsonl_path)
+            except FileNotFoundError:
+                pass
     
     def _calculate_processing_time(self, job: Dict) -> float:
         """Calculate total processing time in seconds"""
-        if not job['start_time'] or not job['end_time']:
+        start_epoch, end_epoch = job.get('start_epoch'), job.get('end_epoch')
+        if start_epoch is not None and end_epoch is not None:
+            return end_epoch - start_epoch
+        
+        # Jobs saved before the epoch fields were added
+        if not job.get('start_time') or not job.get('end_time'):
             return 0
         
         start = datetime.fromisoformat(job['start_time'])
@@ -177,12 +521,29 @@ class JobManager:
         return (end - start).total_seconds()
     
     def get_job_summary(self, job_id: str) -> Optional[Dict]:
-        """Get job summary for display"""
-        if job_id not in self.jobs:
-            return None
+        """
+        Get job summary for display
         
-        job = self.jobs[job_id]
+        Summaries are cached until the job next changes; jobs still running in another
+        worker are rebuilt from their metadata file every time.
+        """
+        with self.lock:
+            summary = self._summaries.get(job_id)
+        if summary is not None:
+            return summary
         
+        job = self.get_job(job_id)
+        if job is None:
+            return None
+        
+        summary = self._build_summary(job_id, job)
+        with self.lock:
+            if self.jobs.get(job_id) is job and (job_id in self._owned or job.get('status') != JobStatus.PROCESSING.value):
+                self._summaries[job_id] = summary
+        return summary
+    
+    def _build_summary(self, job_id: str, job: Dict) -> Dict:
+        """The fields of a job shown in job listings"""
         return {
             'job_id': job.get('job_id', job_id),
             'status': job.get('status', 'Unknown'),
@@ -203,85 +564,185 @@ class JobManager:
     
     def list_jobs(self) -> List[Dict]:
         """List all jobs with basic info"""
-        return [self.get_job_summary(job_id) for job_id in self.jobs.keys()]
+        self._sync_jobs_from_disk()
+        with self.lock:
+            job_ids = list(self.jobs.keys())
+        summaries = (self.get_job_summary(job_id) for job_id in job_ids)
+        return [summary for summary in summaries if summary is not None]
+    
+    def _job_ids_on_disk(self) -> set:
+        """IDs of all jobs with a metadata or results file"""
+        job_ids = set()
+        with os.scandir(self.jobs_metadata_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.json'):
+                    job_ids.add(entry.name[:-len('.json')])
+        with os.scandir(self.job_results_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith('job_') and entry.name.endswith('_results.jsonl'):
+                    job_ids.add(entry.name[len('job_'):-len('_results.jsonl')])
+        return job_ids
+    
+    def _read_jobs_from_disk(self, job_ids) -> Dict[str, Dict]:
+        """Read several jobs at once, overlapping the file reads on a thread pool"""
+        job_ids = list(job_ids)
+        if len(job_ids) <= 1:
+            jobs = zip(job_ids, map(self._read_job_from_disk, job_ids))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.LOAD_WORKERS, len(job_ids))) as executor:
+                jobs = list(zip(job_ids, executor.map(self._read_job_from_disk, job_ids)))
+        return {job_id: job for job_id, job in jobs if job is not None}
+    
+    def _job_files_exist(self, job_id: str) -> bool:
+        """Whether any of a job's metadata, results or partial results files is present"""
+        paths = (
+            os.path.join(self.jobs_metadata_dir, f"{job_id}.json"),
+            os.path.join(self.job_results_dir, f"job_{job_id}_results.jsonl"),
+            self._partial_results_path(job_id),
+        )
+        return any(os.path.exists(path) for path in paths)
+    
+    def _sync_jobs_from_disk(self):
+        """Pick up jobs created by other workers and forget the ones they deleted"""
+        # Adding, renaming or removing a job file changes its directory's mtime, so the scan is
+        # skipped while neither has changed; the interval covers filesystems with coarse mtimes
+        try:
+            mtimes = (os.stat(self.jobs_metadata_dir).st_mtime_ns, os.stat(self.job_results_dir).st_mtime_ns)
+        except OSError as e:
+            print(f"Error scanning job files: {str(e)}")
+            return
+        now = time.monotonic()
+        with self.lock:
+            last = self._disk_sync
+            if last is not None and last[0] == mtimes and now - last[1] < self.DISK_SYNC_INTERVAL:
+                return
+            self._disk_sync = (mtimes, now)
+        
+        try:
+            on_disk = self._job_ids_on_disk()
+        except OSError as e:
+            print(f"Error scanning job files: {str(e)}")
+            return
+        
+        with self.lock:
+            gone = [job_id for job_id in self.jobs if job_id not in on_disk and job_id not in self._owned]
+        # A file being renamed into place can be missed by the directory scan, so a job is only
+        # forgotten once none of its files can be found
+        gone = [job_id for job_id in gone if not self._job_files_exist(job_id)]
+        with self.lock:
+            for job_id in gone:
+                if job_id not in self._owned:
+                    self.jobs.pop(job_id, None)
+                    self._summaries.pop(job_id, None)
+            missing = on_disk - self.jobs.keys()
+        
+        loaded = self._read_jobs_from_disk(missing)
+        with self.lock:
+            for job_id, job in loaded.items():
+                self.jobs.setdefault(job_id, job)
+    
+    def _read_job_from_disk(self, job_id: str) -> Optional[Dict]:
+        """Read a job from its metadata file, falling back to its results file"""
+        metadata_path = os.path.join(self.jobs_metadata_dir, f"{job_id}.json")
+        try:
+            with open(metadata_path, 'rb') as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return self._read_job_summary(job_id)
+        except Exception as e:
+            print(f"Error loading job metadata for {job_id}: {str(e)}")
+            return None
     
     def _load_existing_jobs(self):
         """Load existing jobs from metadata files and job results files"""
-        # Load from metadata files first
-        if os.path.exists(self.jobs_metadata_dir):
-            for filename in os.listdir(self.jobs_metadata_dir):
-                if filename.endswith('.json'):
-                    job_id = filename.replace('.json', '')
-                    metadata_path = os.path.join(self.jobs_metadata_dir, filename)
-                    
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            job_data = json.load(f)
-                            self.jobs[job_id] = job_data
-                    except Exception as e:
-                        print(f"Error loading job metadata for {job_id}: {str(e)}")
-        
-        # Load from job results files for jobs not already loaded
-        if os.path.exists(self.job_results_dir):
-            for filename in os.listdir(self.job_results_dir):
-                if filename.startswith('job_') and filename.endswith('_results.jsonl'):
-                    job_id = filename.replace('job_', '').replace('_results.jsonl', '')
-                    
-                    # Skip if already loaded from metadata
-                    if job_id in self.jobs:
-                        continue
-                    
-                    try:
-                        self._load_job_results_from_file(job_id)
-                    except Exception as e:
-                        print(f"Error loading job results for {job_id}: {str(e)}")
-    
-    def _save_job_metadata(self, job_id: str):
-        """Save job metadata to JSON file"""
+        # A job's metadata file is read first, falling back to the summary line of its results
+        # file; file results are read when they are asked for
+        try:
+            job_ids = self._job_ids_on_disk()
+        except OSError as e:
+            print(f"Error scanning job files: {str(e)}")
+            return
+        self.jobs.update(self._read_jobs_from_disk(job_ids))
+    
+    def _save_job_metadata(self, job_id: str, durable: bool = False):
+        """Save job metadata to JSON file, fsynced when durable (caller holds the lock)"""
         if job_id not in self.jobs:
             return
         
-        job = self.jobs[job_id]
+        # File results live in the results files, so the metadata stays small however large the job
+        job = {key: value for key, value in self.jobs[job_id].items() if key != 'results'}
         metadata_path = os.path.join(self.jobs_metadata_dir, f"{job_id}.json")
         
+        # Serialized here so the snapshot is consistent; the file is written by the IO thread
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(job, f, indent=2, ensure_ascii=False)
+            payload = _dumps_indented(job)
         except Exception as e:
             print(f"Error saving job metadata for {job_id}: {str(e)}")
+            return
+        try:
+            self._io_executor.submit(self._write_job_metadata, job_id, metadata_path, payload, durable)
+        except RuntimeError:
+            # Interpreter shutdown (the final atexit flush): write in this thread instead
+            self._write_job_metadata(job_id, metadata_path, payload, durable)
     
-    def _load_job_results_from_file(self, job_id: str):
-        """Load job results from JSONL file"""
+    def _write_job_metadata(self, job_id: str, metadata_path: str, payload: bytes, durable: bool = False):
+        """Write a metadata file atomically (runs on the IO thread)"""
+        # Skip jobs deleted while the write was queued, so their file isn't recreated
+        if job_id not in self.jobs:
+            return
+        # A crash mid-write leaves a stray temporary file rather than a truncated metadata file;
+        # the pid keeps workers from writing over each other's
+        tmp_path = f"{metadata_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, metadata_path)
+            if durable:
+                _fsync_directory(self.jobs_metadata_dir)
+        except Exception as e:
+            print(f"Error saving job metadata for {job_id}: {str(e)}")
+    
+    def _read_job_summary(self, job_id: str) -> Optional[Dict]:
+        """Read only the summary line of a job's JSONL file"""
+        jsonl_path = os.path.join(self.job_results_dir, f"job_{job_id}_results.jsonl")
+        try:
+            with open(jsonl_path, 'rb') as f:
+                first = f.readline()
+            return _loads(first) if first else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading job results for {job_id}: {str(e)}")
+            return None
+    
+    def _read_job_results_file(self, job_id: str) -> Optional[Dict]:
+        """Read a job's summary and file results from its JSONL file"""
         jsonl_filename = f"job_{job_id}_results.jsonl"
         jsonl_path = os.path.join(self.job_results_dir, jsonl_filename)
         
         if not os.path.exists(jsonl_path):
-            return
+            return None
         
         try:
-            with open(jsonl_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if lines:
-                    # First line is the summary
-                    summary = json.loads(lines[0])
-                    
-                    # Create job entry if it doesn't exist
-                    if job_id not in self.jobs:
-                        self.jobs[job_id] = {}
-                    
-                    # Update job with summary data
-                    self.jobs[job_id].update(summary)
-                    
-                    # Load individual file results
-                    results = []
-                    for line in lines[1:]:
-                        if line.strip():
-                            result = json.loads(line)
-                            results.append(result)
-                    
-                    self.jobs[job_id]['results'] = results
+            with open(jsonl_path, 'rb', buffering=_FILE_BUFFER_SIZE) as f:
+                # Parsed line by line rather than read into a list of lines first
+                lines = iter(f)
+                
+                # First line is the summary
+                first = next(lines, None)
+                if first is None:
+                    return None
+                job_data = _loads(first)
+                
+                # Load individual file results
+                job_data['results'] = [_loads(line) for line in lines if line.strip()]
+                return job_data
         except Exception as e:
             print(f"Error loading job results for {job_id}: {str(e)}")
+            return None
 
 # Global job manager instance
 job_manager = JobManager()
@@ -1,41 +1,107 @@
+import heapq
 import json
 import os
 import re
+import threading
 from collections import defaultdict
 from datetime import datetime
+from operator import itemgetter
 
 class SearchEngine:
     def __init__(self):
         self.index = defaultdict(list)  # term -> list of (document_id, positions)
         self.documents = {}  # document_id -> document metadata
+        self.doc_ids = {}  # filename -> document_id, so a re-indexed file replaces its earlier entry
+        self.doc_terms = {}  # document_id -> its distinct terms, to find its postings when it is replaced
         self.document_count = 0
+        self.lock = threading.Lock()  # guards the index against background indexing
+        # Bumped on every index change; search caches include it in their keys
+        self.generation = 0
     
     def index_document(self, document_content, filename):
         """Index a document for search using metadata fields"""
-        doc_id = f"doc_{self.document_count}"
-        self.document_count += 1
-        
-        # Store document metadata
-        self.documents[doc_id] = {
-            'filename': filename,
-            'title': document_content.get('title', 'Untitled'),
-            'file_type': document_content.get('file_type', 'Unknown'),
-            'upload_date': document_content.get('upload_date', ''),
-            'author': document_content.get('author', []),
-            'topic': document_content.get('topic', ''),
-            'abstract': document_content.get('abstract', ''),
-            'published_date': document_content.get('published_date', '')
-        }
+        self.index_documents([(document_content, filename)])
+    
+    def index_documents(self, documents):
+        """
+        Index a batch of (document_content, filename) pairs with one index update
         
-        # Create searchable text from metadata fields
-        searchable_text = self._create_searchable_text(document_content)
-        if searchable_text:
-            terms = self._tokenize(searchable_text)
+        A filename that is already indexed replaces its earlier entry, so a document
+        indexed twice (e.g. by the startup rebuild and the upload queue) is found once.
+        """
+        # Tokenize outside the lock; only the index merge needs exclusive access
+        prepared = self._prepare(documents)
+        with self.lock:
+            self._merge_locked(prepared)
+    
+    def replace_documents(self, documents):
+        """Rebuild the index from a batch of (document_content, filename) pairs, dropping all other entries"""
+        prepared = self._prepare(documents)
+        with self.lock:
+            self.index = defaultdict(list)
+            self.documents = {}
+            self.doc_ids = {}
+            self.doc_terms = {}
+            self._merge_locked(prepared)
+    
+    def _prepare(self, documents):
+        """(document_content, filename, terms) for each (document_content, filename) pair"""
+        return [
+            (document_content, filename, self._tokenize(self._create_searchable_text(document_content)))
+            for document_content, filename in documents
+        ]
+    
+    def _merge_locked(self, prepared):
+        """Add prepared documents to the index; caller must hold self.lock"""
+        batch_postings = defaultdict(list)
+        for document_content, filename, terms in prepared:
+            replaced = self.doc_ids.get(filename)
+            if replaced is not None:
+                self._remove_document_locked(replaced, batch_postings)
+            
+            doc_id = f"doc_{self.document_count}"
+            self.document_count += 1
+            self.doc_ids[filename] = doc_id
+            self.doc_terms[doc_id] = frozenset(terms)
+            
+            # Store document metadata
+            self.documents[doc_id] = {
+                'filename': filename,
+                'title': document_content.get('title', 'Untitled'),
+                'file_type': document_content.get('file_type', 'Unknown'),
+                'upload_date': document_content.get('upload_date', ''),
+                'author': document_content.get('author', []),
+                'topic': document_content.get('topic', ''),
+                'abstract': document_content.get('abstract', ''),
+                'published_date': document_content.get('published_date', '')
+            }
+            
             for position, term in enumerate(terms):
-                self.index[term].append((doc_id, position))
+                batch_postings[term].append((doc_id, position))
+        
+        # Extend each posting list once per batch rather than once per occurrence
+        for term, postings in batch_postings.items():
+            self.index[term].extend(postings)
+        self.generation += 1
+    
+    def _remove_document_locked(self, doc_id, batch_postings):
+        """Drop a document and its postings from the index and the pending batch; caller must hold self.lock"""
+        del self.documents[doc_id]
+        for term in self.doc_terms.pop(doc_id):
+            for index in (self.index, batch_postings):
+                postings = index.get(term)
+                if postings:
+                    postings[:] = [posting for posting in postings if posting[0] != doc_id]
+                    if not postings:
+                        del index[term]
     
     def search(self, query, limit=10):
         """Search for documents containing the query terms"""
+        with self.lock:
+            return self._search_locked(query, limit)
+    
+    def _search_locked(self, query, limit):
+        """Run a search; caller must hold self.lock"""
         query_terms = self._tokenize(query.lower())
         if not query_terms:
             return []
@@ -52,11 +118,11 @@ class SearchEngine:
                     if position < 100:
                         doc_scores[doc_id] += 0.5
         
-        # Sort by score and return results
-        sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)
+        # Select the top `limit` scores without sorting every matching document
+        top_docs = heapq.nlargest(limit, doc_scores.items(), key=itemgetter(1))
         
         results = []
-        for doc_id, score in sorted_docs[:limit]:
+        for doc_id, score in top_docs:
             doc_info = self.documents[doc_id].copy()
             doc_info['score'] = score
             doc_info['doc_id'] = doc_id
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Route-level unit tests using Flask's test client (no running server or GROBID needed)
+
+Run with pytest; the app is imported inside a temporary working directory.
+"""
+
+import io
+import json
+
+import pytest
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    # The data folders in Config are relative, so the app's files go under tmp_path
+    monkeypatch.chdir(tmp_path)
+    import app
+    for folder in app.Config.DATA_FOLDERS:
+        (tmp_path / folder).mkdir(exist_ok=True)
+    app.app.config['TESTING'] = True
+    yield app
+    app.job_manager.flush()
+    app.job_manager._wait_for_writes()
+
+
+def test_bulk_upload_fails_job_when_request_errors(app_module, monkeypatch):
+    """A job whose request errors before the job is handed off is failed and its results file closed"""
+    created = []
+    real_create_job = app_module.job_manager.create_job
+
+    def recording_create_job(*args, **kwargs):
+        created.append(real_create_job(*args, **kwargs))
+        return created[-1]
+
+    def failing_submit(*args, **kwargs):
+        raise RuntimeError('parse pool is shut down')
+
+    monkeypatch.setattr(app_module.job_manager, 'create_job', recording_create_job)
+    monkeypatch.setattr(app_module.parse_executor, 'submit', failing_submit)
+
+    client = app_module.app.test_client()
+    with pytest.raises(RuntimeError):
+        client.post('/bulk_upload', data={
+            'files': [(io.BytesIO(b'hello world'), 'a.txt')],
+            'metadata_options': json.dumps(['title']),
+        }, content_type='multipart/form-data')
+
+    job_id = created[0]
+    assert app_module.job_manager.get_job(job_id)['status'] == 'Failed'
+    assert job_id not in app_module.job_manager._result_files
+
+
+def test_get_document_serves_stored_json_with_stored_etag(app_module, tmp_path):
+    """Documents come from the index only, with the ETag stored next to them"""
+    parsed_filename = app_module._save_parsed_document({'title': 'Stored', 'job_id': 'job-1'}, 'a.pdf')
+    assert not (tmp_path / app_module.Config.PARSED_DOCUMENTS_FOLDER / parsed_filename).exists()
+    _, etag = app_module.document_index.get_content(parsed_filename)
+
+    client = app_module.app.test_client()
+    response = client.get(f'/document/{parsed_filename}')
+    assert response.status_code == 200
+    assert response.get_json()['title'] == 'Stored'
+    assert response.headers['ETag'] == f'"{etag}"'
+
+    assert client.get(f'/document/{parsed_filename}', headers={'If-None-Match': f'"{etag}"'}).status_code == 304
+    assert client.get('/document/missing.json').status_code == 404
+
+
+def test_search_sees_documents_stored_by_another_process(app_module):
+    """A write from another connection to the document index rebuilds this process's search index"""
+    from document_index import DocumentIndex
+    db_path = app_module.document_index.conn.execute('PRAGMA database_list').fetchone()[2]
+    other = DocumentIndex(db_path, app_module.document_index.documents_dir)
+
+    other.add('parsed_remote.pdf.json', {'title': 'Zeppelin design notes', 'job_id': 'job-remote'})
+    client = app_module.app.test_client()
+    results = client.get('/search?q=zeppelin').get_json()['results']
+    assert [result['filename'] for result in results] == ['remote.pdf']
+
+    other.remove_job('job-remote')
+    assert client.get('/search?q=zeppelin').get_json()['results'] == []
+    other.conn.close()
+
+
+def test_flag_values_from_json_and_forms(app_module):
+    """Bulk upload routes read async the same way, whether it arrives as a JSON boolean or text"""
+    for value in (True, 'true', ' Yes ', '1', 'on'):
+        assert app_module._flag_value(value) is True
+    for value in (False, 'false', '0', '', 'off', None, 0):
+        assert app_module._flag_value(value) is False
+
+
+def test_duplicate_upload_in_second_job_is_listed_and_deleted_independently(app_module, tmp_path):
+    """A re-uploaded file reuses the earlier parse but is stored, listed and deleted as its own job's document"""
+    html = b'<html><head><title>Duplicate paper</title></head><body>Same bytes</body></html>'
+    client = app_module.app.test_client()
+
+    def upload(name):
+        response = client.post('/bulk_upload', data={
+            'files': [(io.BytesIO(html), name)],
+            'metadata_options': json.dumps(['title']),
+        }, content_type='multipart/form-data')
+        assert response.get_json()['results']['success_count'] == 1
+        return response.get_json()['job_id']
+
+    # Same bytes under another name, since uploads in the same second share a timestamp prefix
+    first, second = upload('paper.html'), upload('paper copy.html')
+    uploads = sorted(path.name for path in (tmp_path / app_module.Config.UPLOAD_FOLDER).iterdir())
+    assert len(uploads) == 2
+
+    def documents():
+        # The app's index outlives a single test, so only these two jobs are looked at
+        listed = client.get('/documents').get_json()['documents']
+        return {doc['job_id']: doc for doc in listed if doc['job_id'] in (first, second)}
+
+    listed = documents()
+    assert sorted(listed) == sorted([first, second])
+    assert listed[first]['filename'] != listed[second]['filename']
+    assert listed[second]['title'] == 'Duplicate paper'
+
+    assert client.delete(f'/jobs/{first}').status_code == 200
+    assert list(documents()) == [second]
+    assert client.get(f"/document/{listed[second]['filename']}").get_json()['job_id'] == second
+    assert all((tmp_path / app_module.Config.UPLOAD_FOLDER / name).exists() for name in uploads)
+
+
+def test_search_cache_is_invalidated_by_index_updates(app_module):
+    """A cached result isn't served once the index generation has moved on"""
+    client = app_module.app.test_client()
+    assert client.get('/search?q=quokka').get_json()['results'] == []
+
+    app_module._index_now([({'title': 'Quokka field study'}, 'quokka.pdf')])
+    results = client.get('/search?q=%20QUOKKA').get_json()['results']
+    assert [result['filename'] for result in results] == ['quokka.pdf']
+    assert client.get('/search').status_code == 400
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the configuration helpers
+"""
+
+import pytest
+
+import config
+from config import Config
+
+
+def test_get_casts_and_defaults(monkeypatch):
+    """Unset variables give the default; set ones are converted with the cast"""
+    monkeypatch.delenv('DOCUSEARCH_TEST_SETTING', raising=False)
+    assert config._get('DOCUSEARCH_TEST_SETTING', 7, int) == 7
+
+    monkeypatch.setenv('DOCUSEARCH_TEST_SETTING', '12')
+    assert config._get('DOCUSEARCH_TEST_SETTING', 7, int) == 12
+    assert config._get('DOCUSEARCH_TEST_SETTING') == '12'
+
+    monkeypatch.setenv('DOCUSEARCH_TEST_SETTING', 'Yes')
+    assert config._get('DOCUSEARCH_TEST_SETTING', False, config._flag) is True
+
+
+def test_get_names_the_variable_on_a_bad_value(monkeypatch):
+    monkeypatch.setenv('DOCUSEARCH_TEST_SETTING', 'twelve')
+    with pytest.raises(ValueError, match='DOCUSEARCH_TEST_SETTING'):
+        config._get('DOCUSEARCH_TEST_SETTING', 7, int)
+
+
+def test_clamp():
+    assert config._clamp(0, 1) == 1
+    assert config._clamp(5, 1) == 5
+    assert config._clamp(5000, 1, 1000) == 1000
+    assert config._clamp(-3, 0, 10) == 0
+
+
+def test_config_is_read_only():
+    """Settings can't be reassigned or deleted at runtime"""
+    with pytest.raises(AttributeError, match='read-only'):
+        Config.MAX_FILE_SIZE_MB = 1
+    with pytest.raises(AttributeError, match='read-only'):
+        del Config.MAX_FILE_SIZE_MB
+    assert Config.MAX_FILE_SIZE_BYTES == Config.MAX_FILE_SIZE_MB * 1024 * 1024
+
+
+if __name__ == '__main__':
+    test_clamp()
+    test_config_is_read_only()
+    print("Config tests passed!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the SQLite document index
+
+Run with pytest; each test works in its own temporary directory.
+"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def index_module(tmp_path, monkeypatch):
+    # The module opens a global index under the relative Config paths on import
+    monkeypatch.chdir(tmp_path)
+    import document_index
+    return document_index
+
+
+@pytest.fixture
+def index(index_module, tmp_path):
+    return index_module.DocumentIndex(str(tmp_path / 'index.db'), str(tmp_path / 'docs'))
+
+
+def _content(title, job_id='job-1'):
+    return {'title': title, 'job_id': job_id, 'upload_date': '2024-01-01T00:00:00', 'file_type': 'PDF'}
+
+
+def test_add_stores_summary_content_and_etag(index):
+    """Listings come from the summaries; contents and their ETag come back as stored"""
+    index.add('parsed_a.pdf.json', _content('A'))
+    index.add('parsed_b.pdf.json', _content('B'))
+    # Replacing a document moves it to the end of the listing
+    index.add('parsed_a.pdf.json', _content('A2'))
+
+    assert [doc['filename'] for doc in index.list_documents()] == ['parsed_b.pdf.json', 'parsed_a.pdf.json']
+    assert index.list_documents()[1]['title'] == 'A2'
+    assert index.list_documents()[0]['author'] == 'Not found'
+
+    content, etag = index.get_content('parsed_a.pdf.json')
+    assert json.loads(content)['title'] == 'A2'
+    assert etag and etag != index.get_content('parsed_b.pdf.json')[1]
+    assert index.get_document('parsed_a.pdf.json')['title'] == 'A2'
+    assert index.get_content('missing.json') is None
+    assert [filename for filename, _ in index.iter_documents()] == ['parsed_b.pdf.json', 'parsed_a.pdf.json']
+
+
+def test_remove_job_and_clear(index):
+    """Removing a job drops only its documents; clearing drops the rest"""
+    index.add('parsed_a.pdf.json', _content('A', 'job-1'))
+    index.add('parsed_b.pdf.json', _content('B', 'job-2'))
+    index.add('parsed_c.pdf.json', _content('C', 'job-1'))
+
+    assert sorted(index.filenames_for_job('job-1')) == ['parsed_a.pdf.json', 'parsed_c.pdf.json']
+    assert index.remove_job('job-1') == 2
+    assert [doc['filename'] for doc in index.list_documents()] == ['parsed_b.pdf.json']
+    assert index.get_content('parsed_a.pdf.json') is None
+
+    assert index.clear() == 1
+    assert index.list_documents() == []
+
+
+def test_lookups_only_return_documents_still_indexed(index):
+    """Remembered S3 objects and content hashes point at a parse only while it is indexed"""
+    index.add('parsed_a.pdf.json', _content('A'))
+    index.remember_s3_object('bucket', 'key', 'etag', 'opts', 'parsed_a.pdf.json')
+    index.remember_content_hash('digest', 'opts', 'parsed_a.pdf.json')
+
+    assert index.lookup_s3_object('bucket', 'key', 'etag', 'opts') == 'parsed_a.pdf.json'
+    assert index.lookup_s3_object('bucket', 'key', 'other', 'opts') is None
+    assert index.lookup_content_hash('digest', 'opts') == 'parsed_a.pdf.json'
+    assert index.lookup_content_hash('digest', 'other') is None
+
+    index.remove('parsed_a.pdf.json')
+    assert index.lookup_s3_object('bucket', 'key', 'etag', 'opts') is None
+    assert index.lookup_content_hash('digest', 'opts') is None
+
+
+def test_sync_with_disk_imports_files_and_keeps_stored_rows(index_module, tmp_path):
+    """Legacy JSON files are imported; rows stored in the table survive without a file"""
+    docs = tmp_path / 'docs'
+    docs.mkdir()
+    (docs / 'parsed_old.pdf.json').write_text(json.dumps(_content('Old')))
+    (docs / 'broken.json').write_text('{not json')
+    db_path = str(tmp_path / 'index.db')
+
+    index = index_module.DocumentIndex(db_path, str(docs))
+    index.add('parsed_new.pdf.json', _content('New'))
+    index.conn.close()
+
+    reopened = index_module.DocumentIndex(db_path, str(docs))
+    assert [doc['filename'] for doc in reopened.list_documents()] == ['parsed_old.pdf.json', 'parsed_new.pdf.json']
+    assert reopened.get_document('parsed_old.pdf.json')['title'] == 'Old'
+    assert reopened.get_content('parsed_old.pdf.json')[1]
+
+
+def test_refresh_picks_up_writes_from_other_connections(index_module, tmp_path):
+    """Another process's writes are seen by listings; this index's own writes don't count as external"""
+    db_path, docs = str(tmp_path / 'index.db'), str(tmp_path / 'docs')
+    index = index_module.DocumentIndex(db_path, docs)
+    other = index_module.DocumentIndex(db_path, docs)
+
+    index.add('parsed_a.pdf.json', _content('A'))
+    assert index.refresh() is False and index.external_writes == 0
+
+    other.add('parsed_b.pdf.json', _content('B'))
+    assert [doc['filename'] for doc in index.list_documents()] == ['parsed_a.pdf.json', 'parsed_b.pdf.json']
+    assert index.external_writes == 1
+    assert index.refresh() is False
+
+    other.remove_job('job-1')
+    assert index.list_documents() == []
+    assert index.external_writes == 2
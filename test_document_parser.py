@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the document parser's module-level helpers (no GROBID needed)
+"""
+
+import pytest
+
+from document_parser import (DocumentParser, _HTMLTitleExtractor, _bibtex_fields, _parse_author_string,
+                             _scan_pdf_page_count)
+
+
+PDF = (b'%PDF-1.4\n'
+       b'1 0 obj << /Type /Catalog /Pages 2 0 R >> endobj\n'
+       b'2 0 obj << /Type /Pages /Kids [3 0 R 4 0 R] /Count 2 >> endobj\n'
+       b'3 0 obj << /Type /Page /Parent 2 0 R >> endobj\n'
+       b'4 0 obj << /Type/Page/Parent 2 0 R >> endobj\n'
+       b'%%EOF\n')
+
+
+BIBTEX = """@article{-1,
+  author = {Jane Smith and Doe, John},
+  title = {Foo {Bar}
+    baz},
+  year = {2021},
+  doi = {10.1000/xyz}
+}
+"""
+
+
+def test_bibtex_fields_keep_nested_braces_and_span_lines():
+    """A value runs to its matching brace, not the first one, and may continue on later lines"""
+    fields = dict(_bibtex_fields(BIBTEX))
+    assert fields['title'] == 'Foo {Bar} baz'
+    assert fields['author'] == 'Jane Smith and Doe, John'
+    assert fields['year'] == '2021'
+    assert fields['doi'] == '10.1000/xyz'
+
+
+def test_bibtex_fields_stop_at_unbalanced_value():
+    """A value that never closes ends the scan instead of swallowing the rest of the record"""
+    assert list(_bibtex_fields('year = {2020},\ntitle = {Open {ended}\n')) == [('year', '2020')]
+
+
+def test_extract_bibtex_metadata():
+    """Requested fields only, with authors split on 'and' and 'Last, First' names reordered"""
+    parser = DocumentParser()
+    result = parser._extract_bibtex_metadata(BIBTEX, ['title', 'author'])
+    assert result['title'] == 'Foo {Bar} baz'
+    assert [author['full_name'] for author in result['author']] == ['Jane Smith', 'John Doe']
+    assert 'published_date' not in result
+
+
+def test_scan_pdf_page_count_counts_page_objects(tmp_path):
+    """Page objects are counted; the /Pages tree node is not"""
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(PDF)
+    assert _scan_pdf_page_count(str(path)) == 2
+
+
+@pytest.mark.parametrize('marker', [b'/ObjStm', b'/Encrypt', b'/Prev'])
+def test_scan_pdf_page_count_bails_out_when_objects_may_be_hidden_or_repeated(tmp_path, marker):
+    """Object streams, encryption and incremental updates leave the count to PyPDF2"""
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(PDF.replace(b'%%EOF', b'5 0 obj << ' + marker + b' 1 >> endobj\n%%EOF'))
+    assert _scan_pdf_page_count(str(path)) is None
+
+
+def test_scan_pdf_page_count_without_pages(tmp_path):
+    path = tmp_path / 'doc.pdf'
+    path.write_bytes(b'%PDF-1.4\n1 0 obj << /Type /Catalog >> endobj\n%%EOF\n')
+    assert _scan_pdf_page_count(str(path)) is None
+
+
+def test_html_title_extractor_keeps_only_the_first_title():
+    extractor = _HTMLTitleExtractor()
+    extractor.feed('<html><head><title>Deep <b>Learning</b> Notes</title><title>Second</title></head>')
+    assert extractor.done
+    assert ''.join(extractor.parts) == 'Deep Learning Notes'
+
+
+def test_parse_html_reads_title_across_chunks(tmp_path):
+    """A title split over the 64 KiB read boundary is still found whole"""
+    path = tmp_path / 'page.html'
+    path.write_text('<html><head>' + ' ' * (64 * 1024 - 20) + '<title> Chunked  Title </title></head></html>',
+                    encoding='utf-8')
+    result = DocumentParser()._parse_html(str(path), ['title', 'author'], None)
+    assert result['title'] == 'Chunked  Title'
+    assert result['author'] == []
+
+
+def test_parse_author_string():
+    """Names are split on ';' or ','; a single word is a last name"""
+    authors = _parse_author_string('Ada Lovelace; Charles Babbage,  Turing')
+    assert [(a['first_name'], a['last_name']) for a in authors] == [
+        ('Ada', 'Lovelace'), ('Charles', 'Babbage'), ('', 'Turing')]
+    assert authors[0]['full_name'] == 'Ada Lovelace'
+    assert _parse_author_string('') == [] and _parse_author_string(None) == []
+    assert _parse_author_string(' ; ,') == []
+
+
+if __name__ == '__main__':
+    test_bibtex_fields_keep_nested_braces_and_span_lines()
+    test_bibtex_fields_stop_at_unbalanced_value()
+    test_extract_bibtex_metadata()
+    test_html_title_extractor_keeps_only_the_first_title()
+    test_parse_author_string()
+    print("Document parser tests passed!")
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Unit tests for JobManager persistence (metadata files, results files, in-memory caches)
+
+Run with pytest; each test works in its own temporary directory.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def job_module(tmp_path, monkeypatch):
+    # The data folders in Config are relative, so every manager lives under tmp_path
+    monkeypatch.chdir(tmp_path)
+    import job_manager
+    return job_manager
+
+
+@pytest.fixture
+def manager(job_module):
+    manager = job_module.JobManager()
+    yield manager
+    # Job files use relative paths; write everything pending before the working directory is restored
+    manager.flush()
+    manager._wait_for_writes()
+
+
+def _run_job(manager, count, success=True):
+    job_id = manager.create_job(count, ['title'])
+    for i in range(count):
+        manager.add_file_result(job_id, f'file_{i}.pdf', True, metadata={'title': f'Title {i}'})
+    manager.complete_job(job_id, success=success)
+    return job_id
+
+
+def test_complete_job_writes_results_without_holding_the_lock(manager, job_module, monkeypatch):
+    """Other jobs can take the manager lock while a finished job's file is copied and synced"""
+    lock_free_during_fsync = []
+    real_fsync = os.fsync
+
+    def try_lock():
+        acquired = manager.lock.acquire(timeout=1)
+        if acquired:
+            manager.lock.release()
+        lock_free_during_fsync.append(acquired)
+
+    def checking_fsync(fd):
+        probe = threading.Thread(target=try_lock)
+        probe.start()
+        probe.join()
+        real_fsync(fd)
+
+    monkeypatch.setattr(job_module.os, 'fsync', checking_fsync)
+    job_id = _run_job(manager, 3)
+
+    assert lock_free_during_fsync and all(lock_free_during_fsync)
+    assert manager.get_job(job_id)['status'] == 'Completed'
+    assert len(manager.get_job_results(job_id)['results']) == 3
+    assert not os.path.exists(manager._partial_results_path(job_id))
+
+
+def test_job_status_reports_truncated_live_results(manager, monkeypatch):
+    """A running job's status carries only the live results and says when older ones were dropped"""
+    monkeypatch.setattr(manager, 'LIVE_RESULTS_SIZE', 3)
+    job_id = manager.create_job(5, ['title'])
+    for i in range(2):
+        manager.add_file_result(job_id, f'file_{i}.pdf', True)
+    status = manager.get_job_status(job_id)
+    assert len(status['results']) == 2 and status['results_truncated'] is False
+
+    for i in range(2, 5):
+        manager.add_file_result(job_id, f'file_{i}.pdf', True)
+    status = manager.get_job_status(job_id)
+    assert [r['filename'] for r in status['results']] == ['file_2.pdf', 'file_3.pdf', 'file_4.pdf']
+    assert status['results_truncated'] is True
+    assert len(manager.get_job_results(job_id)['results']) == 5
+
+
+def test_job_status_of_finished_job_includes_all_results(manager):
+    """Once a job is finished its status carries the full results list again, read from disk"""
+    job_id = _run_job(manager, 4)
+    assert 'results' not in manager.jobs[job_id]
+
+    status = manager.get_job_status(job_id)
+    assert status['status'] == 'Completed'
+    assert len(status['results']) == 4
+    assert status['results_truncated'] is False
+    assert 'processing_time' not in manager.jobs[job_id]
+
+
+def test_list_jobs_rescans_only_on_change_and_keeps_jobs_with_files(manager, job_module, monkeypatch):
+    """Another worker's jobs are picked up by rescans, which are skipped while the job folders are
+    unchanged, and are only forgotten once their files are gone"""
+    other = job_module.JobManager()
+    job_id = _run_job(other, 2)
+    other._wait_for_writes()
+
+    scans = []
+    scan = manager._job_ids_on_disk
+    monkeypatch.setattr(manager, '_job_ids_on_disk', lambda: scans.append(1) or scan())
+    assert [job['job_id'] for job in manager.list_jobs()] == [job_id]
+    assert [job['job_id'] for job in manager.list_jobs()] == [job_id]
+    assert len(scans) == 1
+
+    # A scan that misses the job's files doesn't drop it while they can still be found
+    monkeypatch.setattr(manager, '_job_ids_on_disk', lambda: set())
+    manager._disk_sync = None
+    assert [job['job_id'] for job in manager.list_jobs()] == [job_id]
+
+    other.delete_job(job_id)
+    os.remove(os.path.join(other.jobs_metadata_dir, f'{job_id}.json'))
+    os.remove(os.path.join(other.job_results_dir, f'job_{job_id}_results.jsonl'))
+    manager._disk_sync = None
+    assert manager.list_jobs() == []
+
+
+def test_progress_updates_are_written_by_the_flusher(manager, monkeypatch):
+    """Many progress updates cost at most a flush's worth of metadata writes, with the latest values"""
+    writes = []
+    real_save = manager._save_job_metadata
+
+    def counting_save(job_id, durable=False):
+        writes.append(job_id)
+        real_save(job_id, durable)
+
+    job_id = manager.create_job(100, ['title'])
+    monkeypatch.setattr(manager, '_save_job_metadata', counting_save)
+    for i in range(1, 101):
+        manager.update_job_progress(job_id, f'file_{i}.pdf', i, i, 0)
+    # The flusher thread may have run once meanwhile
+    assert len(writes) <= 1
+
+    manager.flush()
+    manager._wait_for_writes()
+    with open(os.path.join(manager.jobs_metadata_dir, f'{job_id}.json')) as f:
+        saved = json.load(f)
+    assert saved['processed_files'] == 100 and saved['progress_percentage'] == 100
+    assert 'results' not in saved
+    # Written through a temporary file that is renamed into place
+    assert not [name for name in os.listdir(manager.jobs_metadata_dir) if name.endswith('.tmp')]
+
+
+def test_running_job_results_come_from_the_partial_file(manager):
+    """File results are appended as they arrive; a half-written last line is skipped"""
+    job_id = manager.create_job(3, ['title'])
+    manager.add_file_result(job_id, 'a.pdf', True, metadata={'title': 'A'})
+    manager.add_file_result(job_id, 'b.pdf', False, error='boom')
+    assert [r['filename'] for r in manager.get_job_results(job_id)['results']] == ['a.pdf', 'b.pdf']
+
+    with open(manager._partial_results_path(job_id), 'ab') as f:
+        f.write(b'{"filename": "c.pd')
+    assert [r['filename'] for r in manager._read_partial_results(job_id)] == ['a.pdf', 'b.pdf']
+
+
+def test_finished_job_results_file(manager):
+    """The results file holds a summary line, then every result; the partial file is gone"""
+    job_id = _run_job(manager, 3)
+    path = os.path.join(manager.job_results_dir, f'job_{job_id}_results.jsonl')
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    summary, results = lines[0], lines[1:]
+
+    assert summary['status'] == 'Completed' and summary['successful_files'] == 3
+    assert summary['processing_time_seconds'] == summary['end_epoch'] - summary['start_epoch']
+    assert [r['metadata']['title'] for r in results] == ['Title 0', 'Title 1', 'Title 2']
+    assert not os.path.exists(manager._partial_results_path(job_id))
+    assert not [name for name in os.listdir(manager.job_results_dir) if name.endswith('.tmp')]
+
+
+def test_processing_time_uses_epochs_and_falls_back_to_iso_times(manager):
+    assert manager._calculate_processing_time({'start_epoch': 10.0, 'end_epoch': 12.5}) == 2.5
+    assert manager._calculate_processing_time({
+        'start_time': '2024-01-01T00:00:00', 'end_time': '2024-01-01T00:01:30'}) == 90
+    assert manager._calculate_processing_time({'start_time': '2024-01-01T00:00:00', 'end_time': None}) == 0
+
+
+def test_finished_job_results_are_cached_least_recently_used(manager, monkeypatch):
+    """Only RESULTS_CACHE_SIZE finished jobs keep their results in memory; evicted ones are re-read"""
+    monkeypatch.setattr(manager, 'RESULTS_CACHE_SIZE', 2)
+    first, second, third = (_run_job(manager, count) for count in (1, 2, 3))
+
+    reads = []
+    real_read = manager._read_job_results_file
+
+    def counting_read(job_id):
+        reads.append(job_id)
+        return real_read(job_id)
+
+    monkeypatch.setattr(manager, '_read_job_results_file', counting_read)
+    for job_id in (first, second, first, third):
+        manager.get_job_results(job_id)
+    assert reads == [first, second, third]
+    # second was least recently used when third was loaded
+    assert 'results' not in manager.jobs[second]
+    assert len(manager.get_job_results(second)['results']) == 2
+    assert reads[-1] == second
+
+
+def test_finished_job_without_results_is_read_once(manager, monkeypatch):
+    """An empty results list is cached too, rather than re-reading the file on every request"""
+    job_id = _run_job(manager, 0)
+    reads = []
+    real_read = manager._read_job_results_file
+    monkeypatch.setattr(manager, '_read_job_results_file', lambda job_id: reads.append(job_id) or real_read(job_id))
+
+    assert manager.get_job_results(job_id)['results'] == []
+    assert manager.get_job_results(job_id)['results'] == []
+    assert reads == [job_id]
+
+
+def test_job_summary_is_cached_until_the_job_changes(manager):
+    job_id = manager.create_job(2, ['title'])
+    summary = manager.get_job_summary(job_id)
+    assert manager.get_job_summary(job_id) is summary
+
+    manager.add_file_result(job_id, 'a.pdf', True)
+    updated = manager.get_job_summary(job_id)
+    assert updated is not summary and updated['successful_files'] == 1
+    manager.complete_job(job_id)
+    assert manager.get_job_summary(job_id)['status'] == 'Completed'
+
+
+def test_corrupt_file_errors_are_counted(manager):
+    job_id = manager.create_job(4, ['title'])
+    manager.add_file_result(job_id, 'a.pdf', False, error='PDF file appears to be Corrupted: EOF')
+    manager.add_file_result(job_id, 'b.pdf', False, error='File is not readable')
+    manager.add_file_result(job_id, 'c.pdf', False, error='GROBID timed out')
+    manager.add_file_result(job_id, 'd.pdf', False, skip_reason='page_limit')
+    job = manager.get_job(job_id)
+    assert (job['failed_files'], job['corrupt_files']) == (3, 2)
+    assert job['skipped_files'] == 1 and job['skipped_reasons']['page_limit'] == 1
+    manager.complete_job(job_id)
+
+
+def test_jobs_are_loaded_from_disk_by_a_new_manager(manager, job_module):
+    """Metadata files are read at startup, falling back to the results file's summary line"""
+    completed = _run_job(manager, 2)
+    running = manager.create_job(5, ['title'])
+    manager.flush()
+    manager._wait_for_writes()
+    os.remove(os.path.join(manager.jobs_metadata_dir, f'{completed}.json'))
+
+    loaded = job_module.JobManager()
+    try:
+        assert loaded.get_job(completed)['status'] == 'Completed'
+        assert 'results' not in loaded.jobs[completed]
+        assert len(loaded.get_job_results(completed)['results']) == 2
+        assert loaded.get_job(running)['total_files'] == 5
+    finally:
+        loaded._wait_for_writes()
+    manager.complete_job(running)
+
+
+def test_deleted_job_metadata_is_not_rewritten(manager):
+    """A metadata write queued before a job was deleted doesn't bring its file back"""
+    job_id = manager.create_job(1, ['title'])
+    manager._wait_for_writes()
+    metadata_path = os.path.join(manager.jobs_metadata_dir, f'{job_id}.json')
+    assert manager.delete_job(job_id)
+    os.remove(metadata_path)
+
+    manager._write_job_metadata(job_id, metadata_path, b'{}')
+    assert not os.path.exists(metadata_path)
+    assert not os.path.exists(manager._partial_results_path(job_id))
+    assert manager.get_job(job_id) is None
+
+
+def test_json_lines_round_trip(job_module):
+    """Job files decode to what was written, with non-JSON values stored as strings"""
+    from datetime import datetime
+    record = {'name': 'ünïcode', 'when': datetime(2024, 1, 2, 3, 4, 5), 'nested': {'n': [1, 2]}}
+    line = job_module._dumps_line(record)
+    assert line.endswith(b'\n') and line.count(b'\n') == 1
+    decoded = job_module._loads(line)
+    assert decoded['name'] == 'ünïcode' and decoded['nested'] == {'n': [1, 2]}
+    assert isinstance(decoded['when'], str) and decoded['when'].startswith('2024-01-02')
+    assert job_module._loads(job_module._dumps_indented(record))['nested'] == {'n': [1, 2]}
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory search engine
+"""
+
+from search_engine import SearchEngine
+
+
+def _doc(title, **fields):
+    return dict(fields, title=title)
+
+
+def test_index_documents_bumps_generation():
+    """Every index update changes the generation that search caches key on"""
+    engine = SearchEngine()
+    assert engine.generation == 0
+
+    engine.index_documents([(_doc('First paper'), 'a.pdf')])
+    engine.index_document(_doc('Second paper'), 'b.pdf')
+    assert engine.generation == 2
+
+
+def test_search_ranks_by_score_and_limits():
+    """Top hits come back best first and at most `limit` of them"""
+    engine = SearchEngine()
+    engine.index_documents([
+        (_doc('graph'), 'one.pdf'),
+        (_doc('graph graph graph'), 'three.pdf'),
+        (_doc('graph graph'), 'two.pdf'),
+        (_doc('unrelated'), 'none.pdf'),
+    ])
+
+    results = engine.search('graph', limit=2)
+    assert [result['filename'] for result in results] == ['three.pdf', 'two.pdf']
+    assert results[0]['score'] > results[1]['score']
+    assert engine.search('missing') == []
+
+
+def test_reindexing_a_filename_replaces_its_entry():
+    """A file indexed again, in a later batch or the same one, is found once with its latest content"""
+    engine = SearchEngine()
+    engine.index_documents([(_doc('graph theory'), 'a.pdf'), (_doc('graph search'), 'b.pdf')])
+    engine.index_documents([(_doc('graph coloring'), 'a.pdf')])
+    engine.index_documents([(_doc('unused'), 'c.pdf'), (_doc('graph again'), 'c.pdf')])
+
+    assert sorted(result['filename'] for result in engine.search('graph')) == ['a.pdf', 'b.pdf', 'c.pdf']
+    assert [result['title'] for result in engine.search('coloring')] == ['graph coloring']
+    assert engine.search('theory') == [] and engine.search('unused') == []
+    assert 'theory' not in engine.index and 'unused' not in engine.index
+    assert engine.get_document_count() == 3
+
+
+if __name__ == '__main__':
+    test_index_documents_bumps_generation()
+    test_search_ranks_by_score_and_limits()
+    test_reindexing_a_filename_replaces_its_entry()
+    print("Search engine tests passed!")